@@ -0,0 +1,66 @@
+# Comparing one-at-a-time and bulk enqueue/dequeue calls
+
+from time import perf_counter
+from random import Random
+
+from queues import PriorityQueue, Queue, Stack
+
+SIZE = 1_000_000
+BATCH = 1_000
+
+def timed(function, *args):
+    t1 = perf_counter()
+    function(*args)
+    return perf_counter() - t1
+
+def one_by_one(container, elements):
+    for element in elements:
+        container.enqueue(element)
+    for _ in elements:
+        container.dequeue()
+
+def in_batches(container, elements):
+    for start in range(0, len(elements), BATCH):
+        container.enqueue_many(elements[start:start + BATCH])
+    for _ in range(0, len(elements), BATCH):
+        container.dequeue_many(BATCH)
+
+def one_by_one_with_priority(queue, prioritized_values):
+    for priority, value in prioritized_values:
+        queue.enqueue_with_priority(priority, value)
+    for _ in prioritized_values:
+        queue.dequeue()
+
+def all_at_once_with_priority(queue, prioritized_values):
+    queue.enqueue_many(prioritized_values)
+    queue.dequeue_many(len(prioritized_values))
+
+# Bulk calls must return the same elements in the same order
+fifo, lifo = Queue(), Stack()
+fifo.enqueue_many("abcde")
+lifo.enqueue_many("abcde")
+assert fifo.dequeue_many(2) + fifo.dequeue_many(10) == list("abcde")
+assert lifo.dequeue_many(2) + lifo.dequeue_many(10) == list("edcba")
+
+random = Random(42)
+elements = list(range(SIZE))
+prioritized_values = [(random.randint(1, 3), value) for value in elements]
+
+messages = PriorityQueue()
+for priority, value in prioritized_values[:BATCH]:
+    messages.enqueue_with_priority(priority, value)
+expected = [messages.dequeue() for _ in range(BATCH)]
+messages.enqueue_many(prioritized_values[:BATCH])
+assert messages.dequeue_many(BATCH) == expected
+
+print(f"{'type':>14} {'single':>8} {'bulk':>8} {'speedup':>8}")
+for name, single, bulk in (
+    ("Queue", timed(one_by_one, Queue(), elements),
+     timed(in_batches, Queue(), elements)),
+    ("Stack", timed(one_by_one, Stack(), elements),
+     timed(in_batches, Stack(), elements)),
+    ("PriorityQueue",
+     timed(one_by_one_with_priority, PriorityQueue(), prioritized_values),
+     timed(all_at_once_with_priority, PriorityQueue(), prioritized_values)),
+):
+    print(f"{name:>14} {single:>7.2f}s {bulk:>7.2f}s {single / bulk:>7.1f}x")
@@ -1,6 +1,14 @@
+import pickle
+from array import array
 from collections import deque # Representing FIFO and LIFO Queues with a Deque
-from heapq import heappop, heappush
-from itertools import count
+from functools import partial
+from heapq import heapify, heappop, heappush
+from itertools import count, islice
+from mmap import mmap
+from queue import Full
+from struct import Struct
+from tempfile import TemporaryFile
+from threading import Condition
 
 # Building a Queue Data Type
 class IterableMixin:
@@ -11,30 +19,784 @@ class IterableMixin:
         while len(self) > 0:
             yield self.dequeue()
 
+    # Bulk removal returns up to n elements in dequeue order
+    def dequeue_many(self, n):
+        dequeue = self.dequeue
+        return [dequeue() for _ in range(min(n, len(self)))]
+
+    # Non-destructive views built on walk(), which yields the elements in
+    # dequeue order without removing them
+    def peek(self):
+        for element in self.walk():
+            return element
+        raise IndexError("peek from an empty queue")
+
+    def peek_n(self, k):
+        return list(islice(self.walk(), k))
+
 class Queue(IterableMixin):
     def __init__(self, *elements):
         self._elements = deque(elements)
 
+    def walk(self):
+        return iter(self._elements)
+
     def enqueue(self, element):
         self._elements.append(element)
 
     def dequeue(self):
         return self._elements.popleft()
+
+    def enqueue_many(self, elements):
+        self._elements.extend(elements)
+
+    def dequeue_many(self, n):
+        if n >= len(self._elements):
+            elements = list(self._elements)
+            self._elements.clear()
+            return elements
+        popleft = self._elements.popleft
+        return [popleft() for _ in range(n)]
         
 # Building a Stack Data Type
 class Stack(Queue): # Extending Queue class using inheritance
     def dequeue(self): # Overriding the .dequeue method
         return self._elements.pop()
 
-# Building a PriorityQueue Data Type
-class PriorityQueue:
+    def walk(self):
+        return reversed(self._elements)
+
+    def dequeue_many(self, n):
+        if n >= len(self._elements):
+            elements = list(reversed(self._elements))
+            self._elements.clear()
+            return elements
+        pop = self._elements.pop
+        return [pop() for _ in range(n)]
+
+# Fixed-capacity FIFO queue over a preallocated ring buffer; when it's full,
+# enqueue() rejects the element, overwrites the oldest one, or blocks until a
+# consumer makes room, depending on the overflow policy
+OVERFLOW_POLICIES = ("reject", "overwrite", "block")
+
+class BoundedQueue(IterableMixin):
+    def __init__(self, capacity, *elements, overflow="reject"):
+        if capacity < 1:
+            raise ValueError("capacity must be a positive number")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy: {overflow!r}")
+        # Nothing could ever make room for the extra elements, so enqueuing
+        # them would block forever
+        if overflow == "block" and len(elements) > capacity:
+            raise ValueError("more initial elements than the capacity")
+        self._buffer = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._not_full = Condition()
+        self._has_room = lambda: self._size < len(self._buffer)
+        self.overflow = overflow
+        self.high_water_mark = 0
+        self.rejected = 0
+        self.overwritten = 0
+        self.enqueue_many(elements)
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def enqueue(self, element, timeout=None):
+        if self.overflow == "block":
+            with self._not_full:
+                if not self._not_full.wait_for(self._has_room, timeout):
+                    raise Full("queue is full")
+                self._append(element)
+        else:
+            self._append(element)
+
+    def enqueue_many(self, elements):
+        for element in elements:
+            self.enqueue(element)
+
+    def dequeue(self):
+        if self.overflow == "block":
+            with self._not_full:
+                element = self._popleft()
+                self._not_full.notify()
+                return element
+        return self._popleft()
+
+    def walk(self):
+        buffer, head = self._buffer, self._head
+        for offset in range(self._size):
+            yield buffer[(head + offset) % len(buffer)]
+
+    def _append(self, element):
+        buffer = self._buffer
+        if self._size == len(buffer):
+            if self.overflow == "reject":
+                self.rejected += 1
+                raise Full("queue is full")
+            buffer[self._head] = element
+            self._head = (self._head + 1) % len(buffer)
+            self.overwritten += 1
+            return
+        buffer[(self._head + self._size) % len(buffer)] = element
+        self._size += 1
+        if self._size > self.high_water_mark:
+            self.high_water_mark = self._size
+
+    def _popleft(self):
+        if self._size == 0:
+            raise IndexError("dequeue from an empty queue")
+        buffer = self._buffer
+        element, buffer[self._head] = buffer[self._head], None
+        self._head = (self._head + 1) % len(buffer)
+        self._size -= 1
+        return element
+
+# Length prefix of every record in a spill segment
+RECORD_HEADER = Struct("<I")
+
+# An anonymous temporary file of a fixed size, memory-mapped and filled with
+# length-prefixed records that get appended at write_offset and consumed
+# from read_offset
+class SpillSegment:
+    def __init__(self, size, directory=None):
+        self._file = TemporaryFile(dir=directory)
+        self._file.truncate(size)
+        self._buffer = mmap(self._file.fileno(), size)
+        self.size = size
+        self.read_offset = self.write_offset = 0
+
+    def append(self, data):
+        start = self.write_offset + RECORD_HEADER.size
+        if start + len(data) > self.size:
+            return False
+        RECORD_HEADER.pack_into(self._buffer, self.write_offset, len(data))
+        self._buffer[start:start + len(data)] = data
+        self.write_offset = start + len(data)
+        return True
+
+    # Returns the record at the given offset along with the next offset
+    def read(self, offset):
+        (length,) = RECORD_HEADER.unpack_from(self._buffer, offset)
+        start = offset + RECORD_HEADER.size
+        return self._buffer[start:start + length], start + length
+
+    def reset(self):
+        self.read_offset = self.write_offset = 0
+
+    def close(self):
+        self._buffer.close()
+        self._file.close()
+
+# FIFO queue that keeps at most memory_limit elements in memory; beyond that,
+# new elements are pickled into append-only, memory-mapped segment files and
+# read back in batches once the in-memory ones run out, and fully consumed
+# segments are reused for later spills
+class SpillingQueue(IterableMixin):
+    def __init__(
+        self, *elements, memory_limit=10_000, segment_size=2**24, directory=None
+    ):
+        self._elements = deque()
+        self._segments = deque()
+        self._spare_segment = None
+        self._spilled = 0
+        self.memory_limit = memory_limit
+        self.segment_size = segment_size
+        self.directory = directory
+        self.enqueue_many(elements)
+
+    def __len__(self):
+        return len(self._elements) + self._spilled
+
+    def enqueue(self, element):
+        if self._spilled or len(self._elements) >= self.memory_limit:
+            self._spill(element)
+        else:
+            self._elements.append(element)
+
+    def enqueue_many(self, elements):
+        for element in elements:
+            self.enqueue(element)
+
+    def dequeue(self):
+        if not self._elements and self._spilled:
+            self._load(max(self.memory_limit, 1))
+        return self._elements.popleft()
+
+    def walk(self):
+        yield from self._elements
+        for segment in list(self._segments):
+            offset = segment.read_offset
+            while offset < segment.write_offset:
+                data, offset = segment.read(offset)
+                yield pickle.loads(data)
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
+        if self._spare_segment:
+            self._spare_segment.close()
+        self._segments.clear()
+        self._spare_segment = None
+        self._spilled = 0
+
+    def _spill(self, element):
+        data = pickle.dumps(element, pickle.HIGHEST_PROTOCOL)
+        if not self._segments or not self._segments[-1].append(data):
+            segment = self._new_segment(RECORD_HEADER.size + len(data))
+            segment.append(data)
+            self._segments.append(segment)
+        self._spilled += 1
+
+    def _load(self, n):
+        for _ in range(min(n, self._spilled)):
+            segment = self._segments[0]
+            data, segment.read_offset = segment.read(segment.read_offset)
+            self._elements.append(pickle.loads(data))
+            self._spilled -= 1
+            # A drained segment always leaves the queue, even the last one,
+            # since a record that doesn't fit would start a new segment behind it
+            if segment.read_offset == segment.write_offset:
+                self._recycle(self._segments.popleft())
+
+    def _new_segment(self, min_size):
+        if (segment := self._spare_segment) and min_size <= segment.size:
+            self._spare_segment = None
+            return segment
+        return SpillSegment(max(self.segment_size, min_size), self.directory)
+
+    def _recycle(self, segment):
+        segment.reset()
+        if self._spare_segment is None and segment.size == self.segment_size:
+            self._spare_segment = segment
+        else:
+            segment.close()
+
+# Yields the entries of a heap list in sorted order without touching it; only
+# the frontier of visited nodes is kept, so the first k entries cost O(k log k)
+def heap_order(heap, arity=2):
+    if not heap:
+        return
+    frontier = [(heap[0], 0)]
+    while frontier:
+        entry, index = heappop(frontier)
+        yield entry
+        first_child = arity * index + 1
+        for child_index in range(first_child, min(first_child + arity, len(heap))):
+            heappush(frontier, (heap[child_index], child_index))
+
+# Heap engines share one interface: push(entry) returns a handle, pop()
+# removes the smallest entry, extend() adds a batch, walk() yields entries in
+# sorted order, and the indexed engines can update(handle, decreased) after
+# an entry's priority has changed
+
+# The default engine: a plain list managed by the heapq functions
+class BinaryHeap:
     def __init__(self):
-        self._elements = []
+        self._entries = []
+        self.push = partial(heappush, self._entries)
+        self.pop = partial(heappop, self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    # A batch at least as large as the heap is cheaper to append and heapify
+    # in one go than to push one by one
+    def extend(self, entries):
+        entries = list(entries)
+        if len(entries) >= len(self._entries):
+            self._entries.extend(entries)
+            heapify(self._entries)
+        else:
+            for entry in entries:
+                heappush(self._entries, entry)
+
+    def clear(self):
+        self._entries.clear()
+
+    def walk(self):
+        return heap_order(self._entries)
+
+# A heap where every node has `arity` children: shallower than a binary heap,
+# so pushes and decrease-key sift through fewer levels at the cost of more
+# comparisons per level on pop; when indexed, each entry's .index attribute
+# tracks its slot so that update() only sifts that one entry
+class DaryHeap:
+    def __init__(self, arity=4, indexed=False):
+        self.arity = arity
+        self.indexed = indexed
+        self._entries = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def push(self, entry):
+        self._entries.append(entry)
+        self._sift_up(len(self._entries) - 1)
+        return entry
+
+    def pop(self):
+        last = self._entries.pop()
+        if self._entries:
+            first, self._entries[0] = self._entries[0], last
+            self._sift_down(0)
+        else:
+            first = last
+        if self.indexed:
+            first.index = -1
+        return first
+
+    def update(self, entry, decreased):
+        if decreased:
+            self._sift_up(entry.index)
+        else:
+            self._sift_down(entry.index)
+
+    def extend(self, entries):
+        entries = list(entries)
+        if len(entries) < len(self._entries):
+            for entry in entries:
+                self.push(entry)
+            return
+        self._entries.extend(entries)
+        if self.indexed:
+            for index, entry in enumerate(self._entries):
+                entry.index = index
+        for index in reversed(range((len(self._entries) - 2) // self.arity + 1)):
+            self._sift_down(index)
+
+    def clear(self):
+        if self.indexed:
+            for entry in self._entries:
+                entry.index = -1
+        self._entries.clear()
+
+    def walk(self):
+        return heap_order(self._entries, self.arity)
+
+    def _sift_up(self, index):
+        entries, arity, indexed = self._entries, self.arity, self.indexed
+        entry = entries[index]
+        while index > 0:
+            parent_index = (index - 1) // arity
+            parent = entries[parent_index]
+            if not entry < parent:
+                break
+            entries[index] = parent
+            if indexed:
+                parent.index = index
+            index = parent_index
+        entries[index] = entry
+        if indexed:
+            entry.index = index
+
+    def _sift_down(self, index):
+        entries, arity, indexed = self._entries, self.arity, self.indexed
+        entry = entries[index]
+        size = len(entries)
+        while (first_child := arity * index + 1) < size:
+            child_index, child = first_child, entries[first_child]
+            for sibling_index in range(first_child + 1, min(first_child + arity, size)):
+                if entries[sibling_index] < child:
+                    child_index, child = sibling_index, entries[sibling_index]
+            if not child < entry:
+                break
+            entries[index] = child
+            if indexed:
+                child.index = index
+            index = child_index
+        entries[index] = entry
+        if indexed:
+            entry.index = index
+
+class PairingNode:
+    __slots__ = ("entry", "child", "sibling", "previous")
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.child = self.sibling = self.previous = None
+
+# A heap-ordered tree where pushes and decrease-key are O(1) melds with the
+# root and pop() pairs up the root's children in two passes; the handles
+# returned by push() are the tree nodes themselves
+class PairingHeap:
+    def __init__(self):
+        self._root = None
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        nodes = [self._root] if self._root else []
+        while nodes:
+            node = nodes.pop()
+            yield node.entry
+            child = node.child
+            while child:
+                nodes.append(child)
+                child = child.sibling
+
+    def push(self, entry):
+        node = PairingNode(entry)
+        self._root = self._meld(self._root, node)
+        self._size += 1
+        return node
+
+    def pop(self):
+        if (root := self._root) is None:
+            raise IndexError("pop from an empty heap")
+        self._root = self._merge_pairs(root.child)
+        root.child = None
+        self._size -= 1
+        return root.entry
+
+    def update(self, node, decreased):
+        if node is self._root:
+            if decreased:
+                return
+            self._root = self._merge_pairs(node.child)
+        else:
+            self._cut(node)
+            if not decreased:
+                self._root = self._meld(self._root, self._merge_pairs(node.child))
+        if not decreased:
+            node.child = None
+        self._root = self._meld(self._root, node)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.push(entry)
+
+    def clear(self):
+        self._root = None
+        self._size = 0
+
+    def walk(self):
+        if self._root is None:
+            return
+        frontier = [(self._root.entry, self._root)]
+        while frontier:
+            entry, node = heappop(frontier)
+            yield entry
+            child = node.child
+            while child:
+                heappush(frontier, (child.entry, child))
+                child = child.sibling
+
+    @staticmethod
+    def _meld(first, second):
+        if first is None:
+            return second
+        if second is None:
+            return first
+        if second.entry < first.entry:
+            first, second = second, first
+        second.previous = first
+        second.sibling = first.child
+        if first.child:
+            first.child.previous = second
+        first.child = second
+        return first
+
+    @staticmethod
+    def _cut(node):
+        if node.previous.child is node:
+            node.previous.child = node.sibling
+        else:
+            node.previous.sibling = node.sibling
+        if node.sibling:
+            node.sibling.previous = node.previous
+        node.previous = node.sibling = None
+
+    def _merge_pairs(self, first):
+        pairs = []
+        while first:
+            second = first.sibling
+            next_first = second.sibling if second else None
+            first.previous = first.sibling = None
+            if second:
+                second.previous = second.sibling = None
+            pairs.append(self._meld(first, second))
+            first = next_first
+        root = pairs.pop() if pairs else None
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+HEAP_ENGINES = ("binary", "4-ary", "pairing")
+
+# Indexed engines support update() for decrease-key; the heapq-backed binary
+# engine doesn't, so an indexed binary heap is a 2-ary DaryHeap instead
+def make_heap(engine, indexed=False):
+    match engine:
+        case "binary" if not indexed:
+            return BinaryHeap()
+        case "binary":
+            return DaryHeap(2, indexed)
+        case "4-ary":
+            return DaryHeap(4, indexed)
+        case "pairing":
+            return PairingHeap()
+    raise ValueError(f"unknown heap engine: {engine!r}")
+
+# Building a PriorityQueue Data Type
+# Marks the value slot of an entry that was cancelled or already dequeued
+REMOVED = object()
+
+class PriorityQueue(IterableMixin):
+    def __init__(self, engine="binary", compaction_ratio=0.5):
+        self._elements = make_heap(engine)
         self._counter = count()
+        self._cancelled = 0
+        self.compaction_ratio = compaction_ratio
+
+    def __len__(self):
+        return len(self._elements) - self._cancelled
     
+    # Entries are mutable lists, and the returned entry is the handle that
+    # cancel() accepts
     def enqueue_with_priority(self, priority, value):
-        element = (-priority, next(self._counter), value)
-        heappush(self._elements, element)
+        element = [-priority, next(self._counter), value]
+        self._elements.push(element)
+        return element
+
+    # Takes (priority, value) pairs
+    def enqueue_many(self, prioritized_values):
+        counter = self._counter
+        self._elements.extend(
+            [-priority, next(counter), value]
+            for priority, value in prioritized_values
+        )
+
+    # Cancelling only turns the entry into a tombstone in O(1); dequeue()
+    # skips tombstones, and the heap gets rebuilt without them once they
+    # outnumber the given share of its entries
+    def cancel(self, handle):
+        if handle[-1] is REMOVED:
+            return False
+        handle[-1] = REMOVED
+        self._cancelled += 1
+        if self._cancelled > self.compaction_ratio * len(self._elements):
+            self._compact()
+        return True
 
     def dequeue(self):
-        return heappop(self._elements)[-1]
+        while (element := self._elements.pop())[-1] is REMOVED:
+            self._cancelled -= 1
+        value, element[-1] = element[-1], REMOVED
+        return value
+
+    def walk(self):
+        return (
+            element[-1]
+            for element in self._elements.walk()
+            if element[-1] is not REMOVED
+        )
+
+    def dequeue_many(self, n):
+        if n >= len(self):
+            values = []
+            for element in sorted(self._elements):
+                if element[-1] is not REMOVED:
+                    values.append(element[-1])
+                    element[-1] = REMOVED
+            self._elements.clear()
+            self._cancelled = 0
+            return values
+        dequeue = self.dequeue
+        return [dequeue() for _ in range(n)]
+
+    def _compact(self):
+        elements = [
+            element for element in self._elements if element[-1] is not REMOVED
+        ]
+        self._elements.clear()
+        self._elements.extend(elements)
+        self._cancelled = 0
+
+# Priority queue for a small range of integer priorities from 0 to
+# max_priority: one FIFO deque per level and a bitmap of the non-empty levels,
+# whose highest set bit points at the next bucket to dequeue from in O(1)
+class BucketPriorityQueue(IterableMixin):
+    def __init__(self, max_priority):
+        self._buckets = [deque() for _ in range(max_priority + 1)]
+        self._bitmap = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def enqueue_with_priority(self, priority, value):
+        if not 0 <= priority < len(self._buckets):
+            raise ValueError(f"priority out of range: {priority!r}")
+        self._buckets[priority].append(value)
+        self._bitmap |= 1 << priority
+        self._size += 1
+
+    def enqueue_many(self, prioritized_values):
+        for priority, value in prioritized_values:
+            self.enqueue_with_priority(priority, value)
+
+    def dequeue(self):
+        if not self._bitmap:
+            raise IndexError("dequeue from an empty queue")
+        priority = self._bitmap.bit_length() - 1
+        bucket = self._buckets[priority]
+        value = bucket.popleft()
+        if not bucket:
+            self._bitmap &= ~(1 << priority)
+        self._size -= 1
+        return value
+
+    def walk(self):
+        for bucket in reversed(self._buckets):
+            yield from bucket
+
+# Compact storage: priorities, tie-break counters and heap order live in
+# flat arrays indexed by slot number, and values sit in a side list, so an
+# entry costs a few machine words instead of a tuple or dataclass instance
+class SlotHeap:
+    def __init__(self):
+        self._heap = array("q")
+        self._positions = array("q")
+        self._priorities = array("d")
+        self._counts = array("q")
+        self._values = []
+        self._free_slots = array("q")
+        self._counter = count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, priority, value):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._priorities[slot] = priority
+            self._counts[slot] = next(self._counter)
+            self._values[slot] = value
+        else:
+            slot = len(self._values)
+            self._priorities.append(priority)
+            self._counts.append(next(self._counter))
+            self._values.append(value)
+            self._positions.append(-1)
+        self._heap.append(slot)
+        self._sift_up(len(self._heap) - 1)
+        return slot
+
+    def pop(self, recycle=True):
+        last = self._heap.pop()
+        if self._heap:
+            slot, self._heap[0] = self._heap[0], last
+            self._sift_down(0)
+        else:
+            slot = last
+        self._positions[slot] = -1
+        value = self._values[slot]
+        if recycle:
+            self._values[slot] = None
+            self._free_slots.append(slot)
+        return value
+
+    def priority(self, slot):
+        return self._priorities[slot]
+
+    def walk(self):
+        heap, priorities, counts = self._heap, self._priorities, self._counts
+        if not heap:
+            return
+        frontier = [(priorities[heap[0]], counts[heap[0]], 0)]
+        while frontier:
+            *_, index = heappop(frontier)
+            yield self._values[heap[index]]
+            for child_index in (2 * index + 1, 2 * index + 2):
+                if child_index < len(heap):
+                    slot = heap[child_index]
+                    heappush(
+                        frontier, (priorities[slot], counts[slot], child_index)
+                    )
+
+    def update(self, slot, priority):
+        old_priority, self._priorities[slot] = self._priorities[slot], priority
+        if (index := self._positions[slot]) < 0:
+            return
+        if priority < old_priority:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _sift_up(self, index):
+        heap, positions = self._heap, self._positions
+        priorities, counts = self._priorities, self._counts
+        slot = heap[index]
+        priority, order = priorities[slot], counts[slot]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            parent_priority = priorities[parent]
+            if parent_priority < priority or (
+                parent_priority == priority and counts[parent] < order
+            ):
+                break
+            heap[index] = parent
+            positions[parent] = index
+            index = parent_index
+        heap[index] = slot
+        positions[slot] = index
+
+    def _sift_down(self, index):
+        heap, positions = self._heap, self._positions
+        priorities, counts = self._priorities, self._counts
+        slot = heap[index]
+        priority, order = priorities[slot], counts[slot]
+        size = len(heap)
+        while (child_index := 2 * index + 1) < size:
+            child = heap[child_index]
+            if child_index + 1 < size:
+                right = heap[child_index + 1]
+                if priorities[right] < priorities[child] or (
+                    priorities[right] == priorities[child]
+                    and counts[right] < counts[child]
+                ):
+                    child_index, child = child_index + 1, right
+            child_priority = priorities[child]
+            if priority < child_priority or (
+                priority == child_priority and order < counts[child]
+            ):
+                break
+            heap[index] = child
+            positions[child] = index
+            index = child_index
+        heap[index] = slot
+        positions[slot] = index
+
+# Same behavior as PriorityQueue for numeric priorities, stored in a SlotHeap
+class CompactPriorityQueue(IterableMixin):
+    def __init__(self):
+        self._elements = SlotHeap()
+
+    def enqueue_with_priority(self, priority, value):
+        self._elements.push(-priority, value)
+
+    def enqueue_many(self, prioritized_values):
+        push = self._elements.push
+        for priority, value in prioritized_values:
+            push(-priority, value)
+
+    def dequeue(self):
+        return self._elements.pop()
+
+    def walk(self):
+        return self._elements.walk()
@@ -0,0 +1,33 @@
+# Testing the fixed-capacity BoundedQueue and its overflow policies
+
+from queue import Full
+
+from queues import BoundedQueue
+
+# Testing 1: Rejecting new elements when the queue is full
+print("Testing 1:")
+fifo = BoundedQueue(3, "1st", "2nd", "3rd")
+try:
+    fifo.enqueue("4th")
+except Full:
+    print("Rejected 4th, capacity:", fifo.capacity)
+
+for element in fifo:
+    print(element)
+
+# Testing 2: Overwriting the oldest elements
+print("\nTesting 2:")
+fifo = BoundedQueue(3, overflow="overwrite")
+fifo.enqueue_many(["1st", "2nd", "3rd", "4th", "5th"])
+print("Overwritten:", fifo.overwritten)
+print("High-water mark:", fifo.high_water_mark)
+
+for element in fifo:
+    print(element)
+
+# Testing 3: Refusing more initial elements than a blocking queue can ever hold
+print("\nTesting 3:")
+try:
+    BoundedQueue(2, "1st", "2nd", "3rd", overflow="block")
+except ValueError as error:
+    print("Rejected:", error)
@@ -1,6 +1,6 @@
 # Testing PriorityQueue Data Type
 
-from queues import PriorityQueue
+from queues import BucketPriorityQueue, PriorityQueue
 
 # Priority Levels
 CRITICAL = 3
@@ -17,3 +17,34 @@ print(messages.dequeue())
 print(messages.dequeue())
 print(messages.dequeue())
 print(messages.dequeue())
+
+# Peeking at the most urgent messages without dequeuing them
+messages.enqueue_with_priority(NEUTRAL, "Radio station tuned in")
+messages.enqueue_with_priority(CRITICAL, "Brake pedal pressed")
+messages.enqueue_with_priority(IMPORTANT, "Hazard lights turned on")
+
+print("\nPeek:", messages.peek())
+print("Top two:", messages.peek_n(2))
+print("Still queued:", len(messages))
+
+# With only a handful of integer priority levels, a bucket queue avoids the heap altogether
+print("\nBucket priority queue:")
+messages = BucketPriorityQueue(CRITICAL)
+messages.enqueue_with_priority(IMPORTANT, "Windshield wiper turned on")
+messages.enqueue_with_priority(NEUTRAL, "Radio station tuned in")
+messages.enqueue_with_priority(CRITICAL, "Brake pedal pressed")
+messages.enqueue_with_priority(IMPORTANT, "Hazard lights turned on")
+
+for message in messages:
+    print(message)
+
+# Cancelling a message that's still waiting in the queue
+print("\nCancelling:")
+messages = PriorityQueue()
+messages.enqueue_with_priority(IMPORTANT, "Windshield wiper turned on")
+handle = messages.enqueue_with_priority(NEUTRAL, "Radio station tuned in")
+messages.enqueue_with_priority(CRITICAL, "Brake pedal pressed")
+
+print("Cancelled:", messages.cancel(handle))
+for message in messages:
+    print(message)
@@ -22,3 +22,11 @@ for element in fifo:
     print(element)
 
 print("Final length:",len(fifo))
+
+# Testing 3: Peeking and walking don't consume the queue
+print("\nTesting 3:")
+fifo = Queue("1st", "2nd", "3rd")
+print("Peek:", fifo.peek())
+print("First two:", fifo.peek_n(2))
+print("Walk:", list(fifo.walk()))
+print("Length after peeking:", len(fifo))
@@ -0,0 +1,21 @@
+# Testing the SpillingQueue, which moves elements beyond its memory limit to disk
+
+from queues import SpillingQueue
+
+fifo = SpillingQueue(memory_limit=2)
+fifo.enqueue_many(["1st", "2nd", "3rd", "4th", "5th"])
+print("Length:", len(fifo))
+
+for element in fifo:
+    print(element)
+
+fifo.close()
+
+# A drained segment must not be read again when a larger record needs a new one
+fifo = SpillingQueue(memory_limit=0, segment_size=16)
+fifo.enqueue("xx0")
+print(fifo.dequeue())
+fifo.enqueue("x" * 21 + "1")
+print(fifo.dequeue())
+
+fifo.close()
@@ -0,0 +1,169 @@
+# Distances between every pair of cities, computed once over the CSR form of
+# the road map and kept in two square NumPy arrays
+# distances[i, j] is the length of the shortest route from city i to city j,
+# while next_hops[i, j] is the id of the first city after i on that route, or
+# -1 when there's no route, so a path can be read off the table hop by hop
+# Floyd-Warshall updates the whole matrix with one vectorized step per city,
+# which suits small and medium graphs, whereas larger ones run Dijkstra's
+# algorithm from every city in a pool of worker processes
+
+# Necessary modules
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush
+from math import inf as infinity
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from compact_graph import CompactGraph
+from graph import Route
+
+# Floyd-Warshall takes O(V³) time, but every step runs in NumPy, so on sparse
+# road maps it keeps up with V separate searches in pure Python up to about
+# this many cities
+FLOYD_WARSHALL_LIMIT = 500
+
+class AllPairs(NamedTuple):
+    graph: CompactGraph
+    distances: np.ndarray
+    next_hops: np.ndarray
+
+    def distance(self, source, destination):
+        ids = self.graph.ids
+        return float(self.distances[ids[source], ids[destination]])
+
+    def path(self, source, destination):
+        ids, cities = self.graph.ids, self.graph.cities
+        node_id, destination_id = ids[source], ids[destination]
+        if self.next_hops[node_id, destination_id] == -1:
+            return None
+        path = [source]
+        while node_id != destination_id:
+            node_id = int(self.next_hops[node_id, destination_id])
+            path.append(cities[node_id])
+        return path
+
+    # Looking up a route settles no cities at all
+    def route(self, source, destination):
+        return Route(
+            self.path(source, destination), self.distance(source, destination), 0
+        )
+
+    # Each table goes to its own .npy file, which np.load() can memory-map,
+    # and the graph's digest goes to a small text file next to them
+    def save(self, path):
+        distances_path, next_hops_path, digest_path = table_paths(path)
+        distances_path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(distances_path, self.distances)
+        np.save(next_hops_path, self.next_hops)
+        digest_path.write_text(graph_digest(self.graph), encoding="utf-8")
+
+def table_paths(path):
+    path = Path(path)
+    return (
+        path.with_name(f"{path.name}.distances.npy"),
+        path.with_name(f"{path.name}.next_hops.npy"),
+        path.with_name(f"{path.name}.digest"),
+    )
+
+# Covers the cities in id order along with the CSR arrays, so a graph that only
+# lists the same cities in another order gets a different digest
+def graph_digest(graph):
+    digest = hashlib.sha256(repr(graph.cities).encode("utf-8"))
+    for array in (graph.offsets, graph.neighbors, graph.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+# The tables only make sense with the graph that they were computed for, since
+# rows and columns follow its city ids
+def load_all_pairs(path, graph, mmap_mode="r"):
+    distances_path, next_hops_path, digest_path = table_paths(path)
+    if digest_path.read_text(encoding="utf-8") != graph_digest(graph):
+        raise ValueError(f"{path} was computed for a different graph")
+    distances = np.load(distances_path, mmap_mode=mmap_mode)
+    next_hops = np.load(next_hops_path, mmap_mode=mmap_mode)
+    return AllPairs(graph, distances, next_hops)
+
+def all_pairs(graph, method="auto", processes=None):
+    if method == "auto":
+        small = graph.num_nodes <= FLOYD_WARSHALL_LIMIT
+        method = "floyd-warshall" if small else "dijkstra"
+    if method == "floyd-warshall":
+        return floyd_warshall(graph)
+    if method == "dijkstra":
+        return parallel_dijkstra(graph, processes)
+    raise ValueError(f"unknown method {method!r}")
+
+# Going through city k shortens the route from i to j when
+# distances[i, k] + distances[k, j] < distances[i, j], and NumPy checks that for
+# all (i, j) at once by adding a column to a row
+def floyd_warshall(graph):
+    size = graph.num_nodes
+    distances = np.full((size, size), infinity)
+    next_hops = np.full((size, size), -1, dtype=np.int32)
+    sources = np.repeat(np.arange(size), np.diff(graph.offsets))
+    np.minimum.at(distances, (sources, graph.neighbors), graph.weights)
+    next_hops[sources, graph.neighbors] = graph.neighbors
+    np.fill_diagonal(distances, 0.0)
+    np.fill_diagonal(next_hops, np.arange(size))
+
+    for k in range(size):
+        through_k = distances[:, k, np.newaxis] + distances[np.newaxis, k, :]
+        shorter = through_k < distances
+        np.copyto(distances, through_k, where=shorter)
+        np.copyto(
+            next_hops, np.broadcast_to(next_hops[:, k, np.newaxis], shorter.shape),
+            where=shorter,
+        )
+    return AllPairs(graph, distances, next_hops)
+
+def parallel_dijkstra(graph, processes=None):
+    size = graph.num_nodes
+    distances = np.empty((size, size))
+    next_hops = np.empty((size, size), dtype=np.int32)
+    chunksize = max(1, size // (4 * (processes or 8)))
+    with ProcessPoolExecutor(
+        processes, initializer=share_graph, initargs=(graph,)
+    ) as executor:
+        rows = executor.map(dijkstra_row, range(size), chunksize=chunksize)
+        for source_id, (distance_row, next_hop_row) in enumerate(rows):
+            distances[source_id] = distance_row
+            next_hops[source_id] = next_hop_row
+    return AllPairs(graph, distances, next_hops)
+
+# Every worker process receives the graph once, rather than with every task
+shared_graph = None
+
+def share_graph(graph):
+    global shared_graph
+    shared_graph = graph
+
+# The first hop towards a city is inherited from its predecessor, which is
+# always settled before the city itself
+def dijkstra_row(source_id, graph=None):
+    if graph is None:
+        graph = shared_graph
+    offsets, neighbors, weights = graph.adjacency()
+    distances = [infinity] * graph.num_nodes
+    previous = [-1] * graph.num_nodes
+    next_hops = [-1] * graph.num_nodes
+    distances[source_id] = 0.0
+    next_hops[source_id] = source_id
+    unvisited = [(0.0, source_id)]
+    while unvisited:
+        distance, node_id = heappop(unvisited)
+        if distance > distances[node_id]:
+            continue
+        if node_id != source_id:
+            parent_id = previous[node_id]
+            next_hops[node_id] = node_id if parent_id == source_id else next_hops[parent_id]
+        for index in range(offsets[node_id], offsets[node_id + 1]):
+            neighbor = neighbors[index]
+            new_distance = distance + weights[index]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = node_id
+                heappush(unvisited, (new_distance, neighbor))
+    return np.array(distances), np.array(next_hops, dtype=np.int32)
@@ -0,0 +1,88 @@
+# Answering batches of route queries in a pool of worker processes
+# The CSR arrays of the road map are copied into shared memory once, and every
+# worker maps them into its own address space when it starts, so neither the
+# graph nor its cities are ever pickled; queries travel as pairs of integer
+# ids, and the paths come back as lists of ids in the order of the queries
+
+# Necessary modules
+import os
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import compact_graph
+from compact_graph import CompactGraph
+
+class BatchRouter:
+    # Shared memory outlives the process unless it's unlinked, so the blocks
+    # created so far are released again when the setup fails halfway
+    def __init__(self, graph, processes=None):
+        self.graph = graph
+        self.processes = processes or os.cpu_count()
+        self._blocks = []
+        layout = []
+        try:
+            for array in (graph.offsets, graph.neighbors, graph.weights):
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(array.shape, array.dtype, block.buf)[:] = array
+                layout.append((block.name, array.shape, array.dtype.str))
+            self._pool = Pool(
+                self.processes, initializer=attach_graph, initargs=(layout,)
+            )
+        except BaseException:
+            self._release_blocks()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def route_many(self, queries, chunksize=None):
+        ids, cities = self.graph.ids, self.graph.cities
+        pairs = [(ids[source], ids[destination]) for source, destination in queries]
+        if chunksize is None:
+            chunksize = max(1, len(pairs) // (4 * self.processes))
+        return [
+            route._replace(path=[cities[node_id] for node_id in route.path])
+            if route.path else route
+            for route in self._pool.imap(route_ids, pairs, chunksize)
+        ]
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+        self._release_blocks()
+
+    def _release_blocks(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+def route_many(graph, queries, processes=None):
+    with BatchRouter(graph, processes) as router:
+        return router.route_many(queries)
+
+# Each worker keeps its own view of the shared arrays; the cities and their
+# ids are both plain integers there, so compact_graph's Dijkstra returns paths
+# of ids
+shared_graph = None
+shared_blocks = []
+
+def attach_graph(layout):
+    global shared_graph
+    arrays = []
+    for name, shape, dtype in layout:
+        block = SharedMemory(name=name)
+        shared_blocks.append(block)
+        arrays.append(np.ndarray(shape, dtype, block.buf))
+    node_ids = range(len(arrays[0]) - 1)
+    shared_graph = CompactGraph(node_ids, node_ids, *arrays)
+
+def route_ids(pair):
+    source_id, destination_id = pair
+    return compact_graph.dijkstra_shortest_path(shared_graph, source_id, destination_id)
@@ -0,0 +1,28 @@
+# Checking that A* finds routes as short as Dijkstra's algorithm while settling fewer cities
+# To run this script, type this command:
+# $ python benchmarking_a_star.py
+
+from graph import City, a_star_shortest_path, dijkstra_shortest_path, load_graph
+
+def distance(weights):
+    return float(weights["distance"])
+
+nodes, graph = load_graph("roadmap.dot", City.from_dict)
+
+dijkstra_expanded = a_star_expanded = 0
+for city1 in graph.nodes:
+    for city2 in graph.nodes:
+        dijkstra = dijkstra_shortest_path(graph, city1, city2, distance)
+        a_star = a_star_shortest_path(graph, city1, city2, distance)
+        assert a_star.distance == dijkstra.distance, (city1.name, city2.name)
+        dijkstra_expanded += dijkstra.expanded
+        a_star_expanded += a_star.expanded
+
+print(f"Same distances for all {len(graph) ** 2} pairs of cities")
+print(f"Cities settled by Dijkstra's algorithm: {dijkstra_expanded}")
+print(f"Cities settled by A*: {a_star_expanded}")
+print(f"Saving: {1 - a_star_expanded / dijkstra_expanded:.0%}")
+
+route = a_star_shortest_path(graph, nodes["london"], nodes["edinburgh"], distance)
+print("\nLondon → Edinburgh:", " → ".join(city.name for city in route.path))
+print(f"{route.distance:.0f} miles, {route.expanded} cities settled")
@@ -0,0 +1,43 @@
+# Computing the distances between all pairs of cities once, saving them next to
+# the cached graph, and answering route queries from the memory-mapped tables
+# To run this script, type this command:
+# $ python benchmarking_all_pairs.py
+
+# Necessary modules
+from time import perf_counter
+
+from all_pairs import floyd_warshall, load_all_pairs, parallel_dijkstra
+from compact_graph import load_compact_graph
+from graph import City, dijkstra_shortest_path, load_graph, snapshot_path
+
+def distance(weights):
+    return float(weights["distance"])
+
+nodes, compact = load_compact_graph("roadmap.dot", City.from_dict, distance)
+_, graph = load_graph("roadmap.dot", City.from_dict)
+
+for name, method in (("Floyd-Warshall", floyd_warshall), ("Dijkstra", parallel_dijkstra)):
+    t1 = perf_counter()
+    tables = method(compact)
+    print(f"{name}: {perf_counter() - t1:.2f}s for {compact.num_nodes ** 2} pairs")
+
+path = snapshot_path("roadmap.dot").with_suffix(".all_pairs")
+tables.save(path)
+tables = load_all_pairs(path, compact)
+
+t1 = perf_counter()
+for city1 in graph.nodes:
+    for city2 in graph.nodes:
+        tables.route(city1, city2)
+lookup_time = perf_counter() - t1
+
+t1 = perf_counter()
+for city1 in graph.nodes:
+    for city2 in graph.nodes:
+        dijkstra_shortest_path(graph, city1, city2, distance)
+search_time = perf_counter() - t1
+print(f"Lookups: {lookup_time:.2f}s, searches: {search_time:.2f}s")
+
+route = tables.route(nodes["london"], nodes["edinburgh"])
+print("\nLondon → Edinburgh:", " → ".join(city.name for city in route.path))
+print(f"{route.distance:.0f} miles")
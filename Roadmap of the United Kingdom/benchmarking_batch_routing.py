@@ -0,0 +1,32 @@
+# Comparing a loop over dijkstra_shortest_path() with batches of queries
+# answered by worker processes that share the graph's memory
+# To run this script, type this command:
+# $ python benchmarking_batch_routing.py
+
+# Necessary modules
+import os
+from random import Random
+from time import perf_counter
+
+import compact_graph
+from batch_routing import BatchRouter
+from benchmarking_mutable_min_heap import distance, random_road_graph
+
+if __name__ == "__main__":
+    graph = compact_graph.to_compact_graph(random_road_graph(10**5), distance)
+    random = Random(42)
+    queries = [
+        (random.choice(graph.cities), random.choice(graph.cities)) for _ in range(200)
+    ]
+
+    t1 = perf_counter()
+    expected = [compact_graph.dijkstra_shortest_path(graph, *query) for query in queries]
+    print(f"{'loop':>12}: {perf_counter() - t1:.2f}s")
+
+    for processes in sorted({1, 2, 4, os.cpu_count()}):
+        with BatchRouter(graph, processes) as router:
+            t1 = perf_counter()
+            routes = router.route_many(queries)
+            elapsed = perf_counter() - t1
+        assert routes == expected
+        print(f"{processes:>2} processes: {elapsed:.2f}s")
@@ -0,0 +1,56 @@
+# Comparing memory and traversal time of networkx graphs and the CSR form
+# To run this script, type this command:
+# $ python benchmarking_compact_graph.py
+
+# Necessary modules
+import tracemalloc
+from time import perf_counter
+
+import compact_graph
+import graph
+from benchmarking_mutable_min_heap import distance, random_road_graph
+
+def traced(function, *args):
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+def timed(function, *args):
+    t1 = perf_counter()
+    result = function(*args)
+    return result, perf_counter() - t1
+
+def exhaust(traverse, road_graph, source):
+    return sum(1 for _ in traverse(road_graph, source))
+
+if __name__ == "__main__":
+    print(f"{'nodes':>9} {'':>10} {'memory':>10} {'bfs':>8} {'dfs':>8} {'dijkstra':>9}")
+    for num_nodes in (10**4, 10**5, 3 * 10**5):
+        road_graph, graph_memory = traced(random_road_graph, num_nodes)
+        compact, compact_memory = traced(
+            compact_graph.to_compact_graph, road_graph, distance
+        )
+        nodes = list(road_graph.nodes)
+        source, destination = nodes[0], nodes[-1]
+
+        for name, module, target, memory, extra in (
+            ("networkx", graph, road_graph, graph_memory, (distance,)),
+            ("csr", compact_graph, compact, compact_memory, ()),
+        ):
+            visited_bfs, bfs_time = timed(
+                exhaust, module.breadth_first_traverse, target, source
+            )
+            visited_dfs, dfs_time = timed(
+                exhaust, module.depth_first_traverse, target, source
+            )
+            _, dijkstra_time = timed(
+                module.dijkstra_shortest_path, target, source, destination, *extra
+            )
+            assert visited_bfs == visited_dfs == len(nodes)
+            print(
+                f"{len(nodes):>9} {name:>10} {memory / 2**20:>8.1f}MB"
+                f" {bfs_time:>7.2f}s {dfs_time:>7.2f}s {dijkstra_time:>8.2f}s"
+            )
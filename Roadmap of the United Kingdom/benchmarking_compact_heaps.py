@@ -0,0 +1,79 @@
+# Measuring memory and time of the compact, array-backed heaps against the
+# tuple-based PriorityQueue and the dataclass-based MutableMinHeap
+# To run this script, type this command:
+# $ python benchmarking_compact_heaps.py
+
+# Necessary modules
+import tracemalloc
+from random import Random
+from time import perf_counter
+
+from queues import (
+    CompactMutableMinHeap,
+    CompactPriorityQueue,
+    MutableMinHeap,
+    PriorityQueue,
+)
+
+def fill_priority_queue(queue, priorities):
+    for value, priority in enumerate(priorities):
+        queue.enqueue_with_priority(priority, value)
+
+def fill_mutable_min_heap(heap, priorities):
+    for value, priority in enumerate(priorities):
+        heap[value] = priority
+    for value, priority in enumerate(priorities):
+        heap[value] = priority / 2
+
+# Dequeue exactly as many items as were added, which keeps a len() check per item out of the timings
+def drain(queue, size):
+    return [queue.dequeue() for _ in range(size)]
+
+# Traced memory held after filling, and the time to fill and to drain
+def measure(queue_type, fill, priorities):
+    tracemalloc.start()
+    queue = queue_type()
+    fill(queue, priorities)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    queue = queue_type()
+    t1 = perf_counter()
+    fill(queue, priorities)
+    t2 = perf_counter()
+    drain(queue, len(priorities))
+    t3 = perf_counter()
+    return memory, t2 - t1, t3 - t2
+
+def check_same_order(old_type, new_type, fill, priorities):
+    old_queue, new_queue = old_type(), new_type()
+    fill(old_queue, priorities)
+    fill(new_queue, priorities)
+    size = len(priorities)
+    assert drain(old_queue, size) == drain(new_queue, size)
+
+if __name__ == "__main__":
+    random = Random(42)
+    pairs = (
+        (PriorityQueue, CompactPriorityQueue, fill_priority_queue),
+        (MutableMinHeap, CompactMutableMinHeap, fill_mutable_min_heap),
+    )
+
+    priorities = [random.randint(0, 100) for _ in range(10_000)]
+    for old_type, new_type, fill in pairs:
+        check_same_order(old_type, new_type, fill, priorities)
+    print("Same dequeue order as the original heaps: OK\n")
+
+    print(f"{'type':>22} {'items':>9} {'memory':>10} {'fill':>8} {'drain':>8}")
+    for size in (10**5, 10**6):
+        priorities = [random.random() for _ in range(size)]
+        for queue_types in pairs:
+            for queue_type in queue_types[:2]:
+                memory, fill_time, drain_time = measure(
+                    queue_type, queue_types[2], priorities
+                )
+                print(
+                    f"{queue_type.__name__:>22} {size:>9}"
+                    f" {memory / 2**20:>8.1f}MB"
+                    f" {fill_time:>7.2f}s {drain_time:>7.2f}s"
+                )
@@ -0,0 +1,61 @@
+# Checking that the contraction hierarchy finds routes as short as Dijkstra's
+# algorithm while settling far fewer cities
+# To run this script, type this command:
+# $ python benchmarking_contraction_hierarchy.py
+
+# Necessary modules
+from random import Random
+from time import perf_counter
+
+from benchmarking_mutable_min_heap import random_road_graph
+from benchmarking_mutable_min_heap import distance as random_distance
+from contraction_hierarchy import (
+    build_contraction_hierarchy,
+    load_contraction_hierarchy,
+)
+from graph import City, dijkstra_shortest_path
+
+def distance(weights):
+    return float(weights["distance"])
+
+# The hierarchy is built on the first run and read from .graph_cache afterwards
+t1 = perf_counter()
+nodes, graph, hierarchy = load_contraction_hierarchy(
+    "roadmap.dot", City.from_dict, distance
+)
+print(f"Loaded the road map and its hierarchy in {perf_counter() - t1:.2f}s")
+
+dijkstra_expanded = hierarchy_expanded = 0
+for city1 in graph.nodes:
+    for city2 in graph.nodes:
+        dijkstra = dijkstra_shortest_path(graph, city1, city2, distance)
+        route = hierarchy.shortest_path(city1, city2)
+        assert route.distance == dijkstra.distance, (city1.name, city2.name)
+        dijkstra_expanded += dijkstra.expanded
+        hierarchy_expanded += route.expanded
+
+print(f"Same distances for all {len(graph) ** 2} pairs of cities")
+print(f"Cities settled by Dijkstra's algorithm: {dijkstra_expanded}")
+print(f"Cities settled with the hierarchy: {hierarchy_expanded}")
+
+route = hierarchy.shortest_path(nodes["london"], nodes["edinburgh"])
+print("\nLondon → Edinburgh:", " → ".join(city.name for city in route.path))
+print(f"{route.distance:.0f} miles, {route.expanded} cities settled")
+
+road_graph = random_road_graph(20_000)
+t1 = perf_counter()
+hierarchy = build_contraction_hierarchy(road_graph, random_distance)
+print(f"\nPreprocessed {len(road_graph)} random cities in {perf_counter() - t1:.1f}s")
+
+random = Random(42)
+cities = list(road_graph.nodes)
+dijkstra_time = hierarchy_time = 0.0
+for _ in range(50):
+    city1, city2 = random.choice(cities), random.choice(cities)
+    t1 = perf_counter()
+    dijkstra_shortest_path(road_graph, city1, city2, random_distance)
+    dijkstra_time += perf_counter() - t1
+    t1 = perf_counter()
+    hierarchy.shortest_path(city1, city2)
+    hierarchy_time += perf_counter() - t1
+print(f"50 queries: Dijkstra {dijkstra_time:.2f}s, hierarchy {hierarchy_time:.3f}s")
@@ -0,0 +1,63 @@
+# Comparing the heap engines of PriorityQueue and MutableMinHeap across
+# push/pop/decrease-key mixes
+# To run this script, type this command:
+# $ python benchmarking_heap_engines.py
+
+# Necessary modules
+from functools import partial
+from random import Random
+from time import perf_counter
+
+from benchmarking_mutable_min_heap import random_road_graph, time_dijkstra
+from queues import HEAP_ENGINES, MutableMinHeap, PriorityQueue
+
+SIZE = 200_000
+
+# Crawler frontier: many pushes for every pop
+def push_heavy(engine, random):
+    queue = PriorityQueue(engine)
+    for value in range(SIZE):
+        queue.enqueue_with_priority(random.random(), value)
+        if value % 4 == 0:
+            queue.dequeue()
+
+# Steady state: one push and one pop on a heap that stays the same size
+def balanced(engine, random):
+    queue = PriorityQueue(engine)
+    queue.enqueue_many((random.random(), value) for value in range(SIZE))
+    for value in range(SIZE):
+        queue.enqueue_with_priority(random.random(), value)
+        queue.dequeue()
+
+# Dijkstra-like: every value gets several decrease-key updates before its pop
+def decrease_key_heavy(engine, random):
+    heap = MutableMinHeap(engine)
+    for value in range(SIZE):
+        heap[value] = 1.0
+    for _ in range(3 * SIZE):
+        value = random.randrange(SIZE)
+        heap[value] = heap[value] * random.random()
+    for _ in range(SIZE):
+        heap.dequeue()
+
+def timed(workload, engine):
+    random = Random(42)
+    t1 = perf_counter()
+    workload(engine, random)
+    return perf_counter() - t1
+
+if __name__ == "__main__":
+    road_graph = random_road_graph(10**5)
+    workloads = {
+        "push-heavy": partial(timed, push_heavy),
+        "balanced": partial(timed, balanced),
+        "decrease-key": partial(timed, decrease_key_heavy),
+        "dijkstra": lambda engine: time_dijkstra(
+            partial(MutableMinHeap, engine), road_graph
+        )[0],
+    }
+
+    print(f"{'workload':>14}" + "".join(f"{e:>10}" for e in HEAP_ENGINES))
+    for name, workload in workloads.items():
+        times = (workload(engine) for engine in HEAP_ENGINES)
+        print(f"{name:>14}" + "".join(f"{t:>9.2f}s" for t in times))
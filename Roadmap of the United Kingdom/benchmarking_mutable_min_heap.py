@@ -0,0 +1,110 @@
+# Comparing the indexed MutableMinHeap with the original heapify-based version
+# To run this script, type this command:
+# $ python benchmarking_mutable_min_heap.py
+
+# Necessary modules
+from dataclasses import dataclass
+from heapq import heapify, heappop, heappush
+from itertools import count
+from random import Random
+from time import perf_counter
+from typing import Any
+
+import networkx as nx
+
+import graph
+from queues import IterableMixin, MutableMinHeap
+
+# The original implementation, which calls heapify() after every priority update
+@dataclass(order=True)
+class Element:
+    priority: float
+    count: int
+    value: Any
+
+class HeapifyMutableMinHeap(IterableMixin):
+    def __init__(self):
+        super().__init__()
+        self._elements_by_value = {}
+        self._elements = []
+        self._counter = count()
+
+    def __setitem__(self, unique_value, priority):
+        if unique_value in self._elements_by_value:
+            self._elements_by_value[unique_value].priority = priority
+            heapify(self._elements)
+        else:
+            element = Element(priority, next(self._counter), unique_value)
+            self._elements_by_value[unique_value] = element
+            heappush(self._elements, element)
+
+    def __getitem__(self, unique_value):
+        return self._elements_by_value[unique_value].priority
+
+    def __contains__(self, unique_value):
+        return unique_value in self._elements_by_value
+
+    def dequeue(self):
+        return heappop(self._elements).value
+
+# Replay the same random mix of inserts, updates and removals on both heaps
+def check_same_order(num_operations=20_000, seed=42):
+    random = Random(seed)
+    old_heap, new_heap = HeapifyMutableMinHeap(), MutableMinHeap()
+    queued = []
+    for _ in range(num_operations):
+        action = random.random()
+        if action < 0.4 or not queued:
+            value = len(old_heap._elements_by_value)
+            priority = random.randint(0, 1000)
+            queued.append(value)
+        elif action < 0.8:
+            value = random.choice(queued)
+            priority = random.randint(0, 1000)
+        else:
+            old_value, new_value = old_heap.dequeue(), new_heap.dequeue()
+            assert old_value == new_value, (old_value, new_value)
+            queued.remove(old_value)
+            continue
+        old_heap[value] = new_heap[value] = priority
+        assert old_heap[value] == new_heap[value]
+    assert list(old_heap) == list(new_heap)
+
+def random_road_graph(num_nodes, seed=42):
+    random = Random(seed)
+    side = round(num_nodes ** 0.5)
+    road_graph = nx.grid_2d_graph(side, side)
+    for _, _, weights in road_graph.edges(data=True):
+        weights["distance"] = random.randint(1, 100)
+    return road_graph
+
+def distance(weights):
+    return float(weights["distance"])
+
+def time_dijkstra(heap_type, road_graph):
+    graph.MutableMinHeap = heap_type
+    try:
+        nodes = list(road_graph.nodes)
+        t1 = perf_counter()
+        path = graph.dijkstra_shortest_path(
+            road_graph, nodes[0], nodes[-1], distance
+        )
+        return perf_counter() - t1, path
+    finally:
+        graph.MutableMinHeap = MutableMinHeap
+
+if __name__ == "__main__":
+    check_same_order()
+    print("Same dequeue order as the heapify-based version: OK\n")
+
+    print(f"{'nodes':>9} {'heapify':>10} {'indexed':>10}")
+    for num_nodes in (10**3, 4 * 10**3, 10**5, 3 * 10**5):
+        road_graph = random_road_graph(num_nodes)
+        new_time, new_path = time_dijkstra(MutableMinHeap, road_graph)
+        if num_nodes <= 4 * 10**3:
+            old_time, old_path = time_dijkstra(HeapifyMutableMinHeap, road_graph)
+            assert old_path == new_path
+            old_column = f"{old_time:>9.2f}s"
+        else:
+            old_column = f"{'-':>10}"
+        print(f"{len(road_graph):>9} {old_column} {new_time:>9.2f}s")
@@ -0,0 +1,152 @@
+# Compressed sparse row (CSR) representation of the road map
+# Every city gets an integer id, and the neighbors and edge weights of city i
+# sit in one contiguous slice, neighbors[offsets[i]:offsets[i + 1]], of flat
+# NumPy arrays, so a traversal walks plain integers instead of hashing City
+# tuples through networkx's dict-of-dicts
+
+# Necessary modules
+from collections import deque
+from heapq import heappop, heappush
+from math import inf as infinity
+from typing import NamedTuple
+
+import numpy as np
+
+from graph import Route, load_graph
+
+class CompactGraph(NamedTuple):
+    cities: list
+    ids: dict
+    offsets: np.ndarray
+    neighbors: np.ndarray
+    weights: np.ndarray
+
+    # A named tuple's len() is its number of fields, which unpacking relies on
+    @property
+    def num_nodes(self):
+        return len(self.cities)
+
+    # Memoryviews hand out Python ints and floats without creating NumPy
+    # scalars, which keeps per-element access fast in pure-Python loops
+    def adjacency(self):
+        return (
+            memoryview(self.offsets),
+            memoryview(self.neighbors),
+            memoryview(self.weights),
+        )
+
+# The neighbors of each city keep the order in which networkx lists them, so
+# traversals visit cities in the same order as the functions in graph.py
+def to_compact_graph(graph, weight_factory):
+    cities = list(graph.nodes)
+    ids = {city: node_id for node_id, city in enumerate(cities)}
+    offsets = np.zeros(len(cities) + 1, dtype=np.int64)
+    neighbors, weights = [], []
+    for node_id, city in enumerate(cities):
+        for neighbor, attributes in graph[city].items():
+            neighbors.append(ids[neighbor])
+            weights.append(weight_factory(attributes))
+        offsets[node_id + 1] = len(neighbors)
+    return CompactGraph(
+        cities,
+        ids,
+        offsets,
+        np.array(neighbors, dtype=np.int32),
+        np.array(weights, dtype=np.float64),
+    )
+
+def load_compact_graph(filename, node_factory, weight_factory):
+    nodes, graph = load_graph(filename, node_factory)
+    return nodes, to_compact_graph(graph, weight_factory)
+
+def sorted_neighbors(graph, neighbors, order_by):
+    if order_by is None:
+        return neighbors
+    cities = graph.cities
+    return sorted(neighbors, key=lambda neighbor: order_by(cities[neighbor]))
+
+def breadth_first_traverse(graph, source, order_by=None):
+    offsets, neighbors, _ = graph.adjacency()
+    source_id = graph.ids[source]
+    visited = bytearray(graph.num_nodes)
+    visited[source_id] = 1
+    queue = deque([source_id])
+    while queue:
+        node_id = queue.popleft()
+        yield graph.cities[node_id]
+        start, stop = offsets[node_id], offsets[node_id + 1]
+        for neighbor in sorted_neighbors(graph, neighbors[start:stop], order_by):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                queue.append(neighbor)
+
+def depth_first_traverse(graph, source, order_by=None):
+    offsets, neighbors, _ = graph.adjacency()
+    visited = bytearray(graph.num_nodes)
+    stack = [graph.ids[source]]
+    while stack:
+        if not visited[node_id := stack.pop()]:
+            yield graph.cities[node_id]
+            visited[node_id] = 1
+            start, stop = offsets[node_id], offsets[node_id + 1]
+            stack.extend(reversed(
+                sorted_neighbors(graph, neighbors[start:stop], order_by)
+            ))
+
+def shortest_path(graph, source, destination, order_by=None):
+    offsets, neighbors, _ = graph.adjacency()
+    source_id, destination_id = graph.ids[source], graph.ids[destination]
+    previous = [-1] * graph.num_nodes
+    previous[source_id] = source_id
+    queue = deque([source_id])
+    while queue:
+        node_id = queue.popleft()
+        start, stop = offsets[node_id], offsets[node_id + 1]
+        for neighbor in sorted_neighbors(graph, neighbors[start:stop], order_by):
+            if previous[neighbor] == -1:
+                previous[neighbor] = node_id
+                queue.append(neighbor)
+                if neighbor == destination_id:
+                    return retrace(graph, previous, source_id, destination_id)
+
+def retrace(graph, previous, source_id, destination_id):
+    path = deque()
+    node_id = destination_id
+    while node_id != source_id:
+        path.appendleft(graph.cities[node_id])
+        node_id = previous[node_id]
+        if node_id == -1:
+            return None
+    path.appendleft(graph.cities[source_id])
+    return list(path)
+
+def connected(graph, source, destination):
+    return shortest_path(graph, source, destination) is not None
+
+# Lazy Dijkstra over the integer ids: stale heap entries are skipped on pop,
+# and the search stops as soon as the destination is settled
+def dijkstra_shortest_path(graph, source, destination):
+    offsets, neighbors, weights = graph.adjacency()
+    source_id, destination_id = graph.ids[source], graph.ids[destination]
+    distances = [infinity] * graph.num_nodes
+    previous = [-1] * graph.num_nodes
+    distances[source_id] = 0.0
+    previous[source_id] = source_id
+    unvisited = [(0.0, source_id)]
+    expanded = 0
+    while unvisited:
+        distance, node_id = heappop(unvisited)
+        if distance > distances[node_id]:
+            continue
+        expanded += 1
+        if node_id == destination_id:
+            path = retrace(graph, previous, source_id, destination_id)
+            return Route(path, distance, expanded)
+        for index in range(offsets[node_id], offsets[node_id + 1]):
+            neighbor = neighbors[index]
+            new_distance = distance + weights[index]
+            if new_distance < distances[neighbor]:
+                distances[neighbor] = new_distance
+                previous[neighbor] = node_id
+                heappush(unvisited, (new_distance, neighbor))
+    return Route(None, infinity, expanded)
@@ -0,0 +1,277 @@
+# Contraction hierarchy for fast point-to-point routing on the road map
+# Preprocessing removes ("contracts") the cities one by one, starting with the
+# least important ones, and adds a shortcut between two neighbors of a removed
+# city whenever the route through it was the only shortest one between them
+# Every city ends up with a rank, and a query runs a bidirectional Dijkstra
+# that only ever climbs to higher-ranked cities, which touches a few dozen
+# cities instead of most of the map, before unpacking the shortcuts again
+
+# Necessary modules
+import hashlib
+from array import array
+from heapq import heappop, heappush
+from math import inf as infinity
+from typing import NamedTuple
+
+from graph import (
+    Route,
+    file_digest,
+    join_paths,
+    load_graph,
+    read_snapshot,
+    save_snapshot,
+    snapshot_path,
+)
+from queues import MutableMinHeap
+
+# How many cities a witness search may settle before it gives up and lets the
+# shortcut in, which is always safe but makes the hierarchy bigger
+WITNESS_LIMIT = 50
+
+class ContractionHierarchy(NamedTuple):
+    ranks: dict
+    upward: dict
+    middles: dict
+
+    # Both searches relax only the edges leading to higher-ranked cities, and
+    # each one stops once its closest unsettled city is farther than the best
+    # route found so far
+    def shortest_path(self, source, destination):
+        if source == destination:
+            return Route([source], 0, 1)
+
+        forward, backward = UpwardSearch(source), UpwardSearch(destination)
+        best_distance, meeting = infinity, None
+        while True:
+            candidates = [
+                search
+                for search in (forward, backward)
+                if search.next_distance() < best_distance
+            ]
+            if not candidates:
+                break
+            search = min(candidates, key=UpwardSearch.next_distance)
+            other = backward if search is forward else forward
+            node, distance = search.settle(self.upward)
+            if node in other.settled:
+                total = distance + other.distances[node]
+                if total < best_distance:
+                    best_distance, meeting = total, node
+
+        expanded = len(forward.settled) + len(backward.settled)
+        if meeting is None:
+            return Route(None, infinity, expanded)
+        path = join_paths(
+            forward.previous, backward.previous, source, destination, meeting
+        )
+        return Route(self.unpack(path), best_distance, expanded)
+
+    # A shortcut expands into the two edges it replaced, which may be
+    # shortcuts themselves
+    def unpack(self, path):
+        unpacked = [path[0]]
+        for node1, node2 in zip(path, path[1:]):
+            edges = [(node1, node2)]
+            while edges:
+                node1, node2 = edges.pop()
+                if (middle := self.middles.get((node1, node2))) is None:
+                    unpacked.append(node2)
+                else:
+                    edges.append((middle, node2))
+                    edges.append((node1, middle))
+        return unpacked
+
+class UpwardSearch:
+    def __init__(self, root):
+        self.distances = {root: 0}
+        self.previous = {}
+        self.settled = set()
+        self.unvisited = [(0, 0, root)]
+        self._counter = 1
+
+    def next_distance(self):
+        while self.unvisited and self.unvisited[0][2] in self.settled:
+            heappop(self.unvisited)
+        return self.unvisited[0][0] if self.unvisited else infinity
+
+    def settle(self, upward):
+        distance, _, node = heappop(self.unvisited)
+        self.settled.add(node)
+        for neighbor, weight in upward[node].items():
+            new_distance = distance + weight
+            if new_distance < self.distances.get(neighbor, infinity):
+                self.distances[neighbor] = new_distance
+                self.previous[neighbor] = node
+                heappush(self.unvisited, (new_distance, self._counter, neighbor))
+                self._counter += 1
+        return node, distance
+
+# Cities are contracted in the order of their edge difference, i.e., the
+# shortcuts they'd add minus the edges they'd remove, plus the number of
+# contracted neighbors, which spreads the contraction evenly over the map
+# Priorities go stale as the graph shrinks, so the next city's priority is
+# recomputed before its contraction and the city goes back into the queue
+# when it has grown
+def build_contraction_hierarchy(graph, weight_factory, witness_limit=WITNESS_LIMIT):
+    adjacency = {node: {} for node in graph.nodes}
+    for node1, node2, weights in graph.edges(data=True):
+        if node1 != node2:
+            weight = weight_factory(weights)
+            if weight < adjacency[node1].get(node2, infinity):
+                adjacency[node1][node2] = adjacency[node2][node1] = weight
+
+    contracted_neighbors = dict.fromkeys(adjacency, 0)
+
+    def priority(node):
+        shortcuts = find_shortcuts(adjacency, node, witness_limit)
+        return len(shortcuts) - len(adjacency[node]) + contracted_neighbors[node]
+
+    unvisited = MutableMinHeap()
+    for node in adjacency:
+        unvisited[node] = priority(node)
+
+    ranks, upward, middles = {}, {}, {}
+    while unvisited:
+        node = unvisited.peek()
+        if (new_priority := priority(node)) > unvisited[node]:
+            unvisited[node] = new_priority
+            continue
+        unvisited.dequeue()
+
+        for node1, node2, weight in find_shortcuts(adjacency, node, witness_limit):
+            adjacency[node1][node2] = adjacency[node2][node1] = weight
+            middles[node1, node2] = middles[node2, node1] = node
+        ranks[node] = len(ranks)
+        upward[node] = neighbors = adjacency.pop(node)
+        for neighbor in neighbors:
+            del adjacency[neighbor][node]
+            contracted_neighbors[neighbor] += 1
+        for neighbor in neighbors:
+            unvisited[neighbor] = priority(neighbor)
+
+    return ContractionHierarchy(ranks, upward, middles)
+
+# A shortcut between two neighbors is needed unless a witness search, which
+# avoids the city being contracted, finds another route that's no longer
+def find_shortcuts(adjacency, node, witness_limit):
+    neighbors = list(adjacency[node].items())
+    shortcuts = []
+    for index, (neighbor1, weight1) in enumerate(neighbors[:-1]):
+        others = neighbors[index + 1:]
+        max_distance = weight1 + max(weight2 for _, weight2 in others)
+        distances = witness_search(
+            adjacency, neighbor1, node, max_distance, witness_limit
+        )
+        for neighbor2, weight2 in others:
+            if distances.get(neighbor2, infinity) > weight1 + weight2:
+                shortcuts.append((neighbor1, neighbor2, weight1 + weight2))
+    return shortcuts
+
+def witness_search(adjacency, source, excluded, max_distance, witness_limit):
+    distances = {source: 0}
+    settled = set()
+    unvisited = [(0, 0, source)]
+    counter = 1
+    while unvisited and len(settled) < witness_limit:
+        distance, _, node = heappop(unvisited)
+        if node in settled:
+            continue
+        if distance > max_distance:
+            break
+        settled.add(node)
+        for neighbor, weight in adjacency[node].items():
+            if neighbor != excluded:
+                new_distance = distance + weight
+                if new_distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = new_distance
+                    heappush(unvisited, (new_distance, counter, neighbor))
+                    counter += 1
+    return distances
+
+# Bumped whenever the stored layout changes, which invalidates older files
+HIERARCHY_VERSION = 3
+
+# The hierarchy is stored next to the graph's snapshot, with the DOT node names
+# standing in for the node objects, so it works with any node factory
+# Weight functions can't be told apart by name, e.g., every lambda is called
+# <lambda>, so each file is named after, and checked against, a fingerprint of
+# the weights that the function gives every edge
+def hierarchy_path(filename, fingerprint):
+    return snapshot_path(filename).with_suffix(f".{fingerprint[:16]}.hierarchy")
+
+def weights_fingerprint(graph, names, weight_factory):
+    edges = sorted(
+        (*sorted((names[node1], names[node2])), repr(weight_factory(weights)))
+        for node1, node2, weights in graph.edges(data=True)
+    )
+    return hashlib.sha256(repr(edges).encode("utf-8")).hexdigest()
+
+# With cache=False, neither the graph's snapshot nor the hierarchy file is read or written
+def load_contraction_hierarchy(filename, node_factory, weight_factory, cache=True):
+    nodes, graph = load_graph(filename, node_factory, cache)
+    if not cache:
+        return nodes, graph, build_contraction_hierarchy(graph, weight_factory)
+    names = {node: name for name, node in nodes.items()}
+    fingerprint = weights_fingerprint(graph, names, weight_factory)
+    path = hierarchy_path(filename, fingerprint)
+    header = {
+        "version": HIERARCHY_VERSION,
+        "digest": file_digest(filename),
+        "fingerprint": fingerprint,
+    }
+    stored, strings, arrays = read_snapshot(path) or ({}, [], {})
+    if all(stored.get(key) == value for key, value in header.items()):
+        return nodes, graph, decode_hierarchy(strings, arrays, nodes)
+
+    hierarchy = build_contraction_hierarchy(graph, weight_factory)
+    save_snapshot(path, header, *encode_hierarchy(hierarchy, names))
+    return nodes, graph, hierarchy
+
+# The cities are stored in the order of their ranks, which makes a city's rank
+# its id, and the upward edges in CSR form, like in compact_graph
+# Weights that are all integers stay integers, so routes from a stored
+# hierarchy have the same lengths as from a freshly built one
+def encode_hierarchy(hierarchy, names):
+    cities = sorted(hierarchy.ranks, key=hierarchy.ranks.get)
+    weights = [
+        weight for city in cities for weight in hierarchy.upward[city].values()
+    ]
+    arrays = {
+        "offsets": array("I", [0]),
+        "neighbors": array("I"),
+        "weights": array(
+            "q" if all(isinstance(weight, int) for weight in weights) else "d",
+            weights,
+        ),
+        "middles": array("I"),
+    }
+    for city in cities:
+        arrays["neighbors"].extend(
+            hierarchy.ranks[neighbor] for neighbor in hierarchy.upward[city]
+        )
+        arrays["offsets"].append(len(arrays["neighbors"]))
+    for (city1, city2), middle in hierarchy.middles.items():
+        arrays["middles"].extend(
+            hierarchy.ranks[city] for city in (city1, city2, middle)
+        )
+    return [names[city] for city in cities], arrays
+
+def decode_hierarchy(strings, arrays, nodes):
+    cities = [nodes[name] for name in strings]
+    offsets, neighbors, weights = (
+        arrays["offsets"], arrays["neighbors"], arrays["weights"]
+    )
+    upward = {
+        city: {
+            cities[neighbors[index]]: weights[index]
+            for index in range(offsets[rank], offsets[rank + 1])
+        }
+        for rank, city in enumerate(cities)
+    }
+    ids = iter(arrays["middles"])
+    middles = {
+        (cities[id1], cities[id2]): cities[middle_id]
+        for id1, id2, middle_id in zip(ids, ids, ids)
+    }
+    ranks = {city: rank for rank, city in enumerate(cities)}
+    return ContractionHierarchy(ranks, upward, middles)
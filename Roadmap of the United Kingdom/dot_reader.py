@@ -0,0 +1,177 @@
+# A streaming reader for the subset of the DOT language used by roadmap.dot
+# It yields nodes and edges one at a time while reading the file line by line,
+# without Graphviz, pygraphviz, or an in-memory copy of the whole graph
+# Supported: graph/digraph/subgraph blocks, graph/node/edge default attributes,
+# node statements, edge chains such as a -- b -- c, quoted strings and comments
+# Like pygraphviz, attributes whose value equals a root-level default aren't
+# reported, while defaults from subgraphs, such as a country, are
+# A node's attributes come from its first declaration
+
+# Necessary modules
+import re
+from typing import NamedTuple
+
+class DotNode(NamedTuple):
+    name: str
+    attributes: dict
+
+class DotEdge(NamedTuple):
+    name1: str
+    name2: str
+    attributes: dict
+
+TOKEN = re.compile(
+    r"""
+    (?P<skip>\s+|//[^\n]*|\#[^\n]*|/\*.*?\*/)
+    |(?P<quoted>"(?:[^"\\]|\\.)*")
+    |(?P<operator>--|->|[{}\[\]=;,:])
+    |(?P<id>[A-Za-z_\x80-\uffff][\w\x80-\uffff]*|-?(?:\.\d+|\d+(?:\.\d*)?))
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+KEYWORDS = {"graph", "digraph", "subgraph", "node", "edge", "strict"}
+
+class Token(NamedTuple):
+    kind: str
+    value: str
+
+# Tokens never span lines, except for quoted strings and block comments, so the
+# buffer only grows past one line while one of those is still open
+def tokenize(lines):
+    buffer = ""
+    for line in lines:
+        buffer += line
+        position = 0
+        while position < len(buffer):
+            if (match := TOKEN.match(buffer, position)) is None:
+                if buffer[position] == '"' or buffer.startswith("/*", position):
+                    break
+                raise SyntaxError(f"unexpected character {buffer[position]!r}")
+            position = match.end()
+            if match.lastgroup == "quoted":
+                yield Token("id", unquote(match.group()))
+            elif match.lastgroup == "id" and match.group().lower() in KEYWORDS:
+                yield Token("keyword", match.group().lower())
+            elif match.lastgroup != "skip":
+                yield Token(match.lastgroup, match.group())
+        buffer = buffer[position:]
+    if buffer.strip():
+        raise SyntaxError("unterminated string or comment")
+
+def unquote(text):
+    return text[1:-1].replace("\\\n", "").replace('\\"', '"')
+
+class Parser:
+    def __init__(self, tokens):
+        self._tokens = tokens
+        self._lookahead = next(tokens, None)
+        self._root_defaults = {"node": {}, "edge": {}}
+        self._declared = set()
+        self._implicit = {}
+
+    def parse(self):
+        self._accept("keyword", "strict")
+        if not (self._accept("keyword", "graph") or self._accept("keyword", "digraph")):
+            raise SyntaxError("expected graph or digraph")
+        self._accept("id")
+        self._expect("operator", "{")
+        yield from self._statements(self._root_defaults)
+        for name, attributes in self._implicit.items():
+            if name not in self._declared:
+                yield DotNode(name, self._visible(attributes, "node"))
+
+    def _statements(self, defaults):
+        while not self._accept("operator", "}"):
+            if self._lookahead is None:
+                raise SyntaxError("missing closing brace")
+            yield from self._statement(defaults)
+            self._accept("operator", ";")
+
+    def _statement(self, defaults):
+        token = self._lookahead
+        if token.kind == "keyword" and token.value in ("graph", "node", "edge"):
+            self._advance()
+            attributes = self._attributes()
+            if token.value != "graph":
+                defaults[token.value].update(attributes)
+        elif token.kind == "keyword" and token.value == "subgraph":
+            self._advance()
+            self._accept("id")
+            self._expect("operator", "{")
+            yield from self._statements(
+                {kind: dict(values) for kind, values in defaults.items()}
+            )
+        elif token == Token("operator", "{"):
+            self._advance()
+            yield from self._statements(
+                {kind: dict(values) for kind, values in defaults.items()}
+            )
+        else:
+            name = self._node_id()
+            if self._accept("operator", "="):
+                self._node_id()
+                return
+            names = [name]
+            while self._accept("operator", "--") or self._accept("operator", "->"):
+                names.append(self._node_id())
+            attributes = self._attributes()
+            if len(names) == 1:
+                if name not in self._declared:
+                    self._declared.add(name)
+                    yield DotNode(
+                        name,
+                        self._visible({**defaults["node"], **attributes}, "node"),
+                    )
+                return
+            for name in names:
+                if name not in self._declared and name not in self._implicit:
+                    self._implicit[name] = dict(defaults["node"])
+            edge_attributes = self._visible({**defaults["edge"], **attributes}, "edge")
+            for name1, name2 in zip(names, names[1:]):
+                yield DotEdge(name1, name2, dict(edge_attributes))
+
+    def _node_id(self):
+        name = self._expect("id").value
+        if self._accept("operator", ":"):
+            self._expect("id")
+        return name
+
+    def _attributes(self):
+        attributes = {}
+        while self._accept("operator", "["):
+            while not self._accept("operator", "]"):
+                key = self._expect("id").value
+                self._expect("operator", "=")
+                attributes[key] = self._expect("id").value
+                self._accept("operator", ",") or self._accept("operator", ";")
+        return attributes
+
+    def _visible(self, attributes, kind):
+        root_defaults = self._root_defaults[kind]
+        return {
+            key: value
+            for key, value in attributes.items()
+            if root_defaults.get(key) != value
+        }
+
+    def _advance(self):
+        token, self._lookahead = self._lookahead, next(self._tokens, None)
+        return token
+
+    def _accept(self, kind, value=None):
+        token = self._lookahead
+        if token and token.kind == kind and value in (None, token.value):
+            return self._advance()
+        return None
+
+    def _expect(self, kind, value=None):
+        if (token := self._accept(kind, value)) is None:
+            raise SyntaxError(f"expected {value or kind}, got {self._lookahead}")
+        return token
+
+# Yields DotNode and DotEdge events in file order; nodes that only appear in
+# edges are yielded at the end, with the defaults in effect where first used
+def read_dot(filename):
+    with open(filename, encoding="utf-8") as file:
+        yield from Parser(tokenize(file)).parse()
@@ -1,10 +1,20 @@
 # Define a custom data type representing a city in the road map
 
 # Necessary modues
-from typing import NamedTuple
+import hashlib
+import json
+import os
+import sys
+from array import array
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, NamedTuple
 import networkx as nx
 from queues import Queue, Stack
-from collections import deque
+from collections import OrderedDict, deque
+from dot_reader import DotEdge, DotNode, read_dot
+from itertools import islice
+from math import asin, cos, radians, sin, sqrt
 from math import inf as infinity
 from queues import MutableMinHeap, Queue, Stack
 
@@ -28,16 +38,432 @@ class City(NamedTuple):
         )
 
 # To take advantage of the new class, create a new graph instance and take note of the mapping of node identifiers to city instances
-def load_graph(filename, node_factory):
-    graph = nx.nx_agraph.read_dot(filename)
-    nodes = {
-        name: node_factory(attributes)
-        for name, attributes in graph.nodes(data=True)
+# Parsed DOT files are cached as binary snapshots, so warm starts skip parsing altogether
+def load_graph(filename, node_factory, cache=True):
+    if cache:
+        events = load_snapshot(filename)
+    else:
+        events = read_dot(filename)
+    return build_graph(events, node_factory)
+
+# Builds the graph while the DOT events stream in; an edge whose cities haven't been declared yet waits until the end of the file
+def build_graph(events, node_factory):
+    nodes, graph, pending = {}, RoadGraph(), []
+    for event in events:
+        match event:
+            case DotNode(name, attributes):
+                nodes[name] = node_factory(attributes)
+            case DotEdge(name1, name2, weights) if name1 in nodes and name2 in nodes:
+                graph.add_edge(nodes[name1], nodes[name2], **weights)
+            case DotEdge():
+                pending.append(event)
+    for name1, name2, weights in pending:
+        graph.add_edge(nodes[name1], nodes[name2], **weights)
+    return nodes, graph
+
+# Union-Find (Disjoint Set) for Connectivity Queries
+# Every element points to a parent in the same component, and the root at the top of each tree stands for the whole component
+# Elements that were never added count as components of their own
+class DisjointSet:
+    def __init__(self, elements=()):
+        self._parents = {}
+        self._sizes = {}
+        for element in elements:
+            self._parents[element] = element
+            self._sizes[element] = 1
+
+    # Path compression points every element on the way straight at the root
+    def find(self, element):
+        root = element
+        while (parent := self._parents.get(root, root)) != root:
+            root = parent
+        while element != root:
+            self._parents[element], element = root, self._parents[element]
+        return root
+
+    # Union by size keeps the trees shallow by hanging the smaller one under the larger one
+    def union(self, element1, element2):
+        root1, root2 = self.find(element1), self.find(element2)
+        if root1 == root2:
+            return False
+        if self._sizes.get(root1, 1) < self._sizes.get(root2, 1):
+            root1, root2 = root2, root1
+        self._parents[root2] = root1
+        self._parents.setdefault(root1, root1)
+        self._sizes[root1] = self._sizes.get(root1, 1) + self._sizes.pop(root2, 1)
+        return True
+
+    def connected(self, element1, element2):
+        return self.find(element1) == self.find(element2)
+
+# A networkx graph that counts its mutations and keeps a connectivity index
+# The index is built on the first connected() query, follows added edges incrementally, and gets rebuilt after anything is removed
+# Changing edge attributes in place, e.g., graph[city1][city2]["distance"] = 42, goes unnoticed, so call add_edge() with the new attributes instead
+class RoadGraph(nx.Graph):
+    def __init__(self, incoming_graph_data=None, **attr):
+        self.version = 0
+        self._connectivity = None
+        self._sorted_adjacency = OrderedDict()
+        self._heuristic_scales = OrderedDict()
+        super().__init__(incoming_graph_data, **attr)
+
+    # The caches are keyed by the caller's strategies, which may be lambdas that can't be pickled, e.g., when sending the graph to another process, so they're left behind and rebuilt on demand
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connectivity"] = None
+        state["_sorted_adjacency"] = OrderedDict()
+        state["_heuristic_scales"] = OrderedDict()
+        return state
+
+    @property
+    def connectivity(self):
+        if self._connectivity is None:
+            self._connectivity = DisjointSet(self.nodes)
+            for city1, city2 in self.edges:
+                self._connectivity.union(city1, city2)
+        return self._connectivity
+
+    def sorted_adjacency(self, order_by=None):
+        return self._cached(self._sorted_adjacency, order_by, SortedAdjacency)
+
+    def heuristic_scale(self, weight_factory):
+        return self._cached(
+            self._heuristic_scales, weight_factory, compute_heuristic_scale
+        )
+
+    # Only the few most recently used strategies are kept, since a lambda
+    # created anew for every query would otherwise pile up
+    def _cached(self, cache, strategy, factory):
+        try:
+            cache.move_to_end(strategy)
+        except KeyError:
+            cache[strategy] = factory(self, strategy)
+            if len(cache) > STRATEGY_CACHE_LIMIT:
+                cache.popitem(last=False)
+        return cache[strategy]
+
+    def add_node(self, node_for_adding, **attr):
+        super().add_node(node_for_adding, **attr)
+        self._changed()
+
+    def add_nodes_from(self, nodes_for_adding, **attr):
+        super().add_nodes_from(nodes_for_adding, **attr)
+        self._changed()
+
+    def add_edge(self, u_of_edge, v_of_edge, **attr):
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self._changed()
+        if self._connectivity is not None:
+            self._connectivity.union(u_of_edge, v_of_edge)
+
+    def add_edges_from(self, ebunch_to_add, **attr):
+        edges = list(ebunch_to_add)
+        super().add_edges_from(edges, **attr)
+        self._changed()
+        if self._connectivity is not None:
+            for edge in edges:
+                self._connectivity.union(edge[0], edge[1])
+
+    def remove_node(self, n):
+        super().remove_node(n)
+        self._removed()
+
+    def remove_nodes_from(self, nodes):
+        super().remove_nodes_from(nodes)
+        self._removed()
+
+    def remove_edge(self, u, v):
+        super().remove_edge(u, v)
+        self._removed()
+
+    def remove_edges_from(self, ebunch):
+        super().remove_edges_from(ebunch)
+        self._removed()
+
+    def clear(self):
+        super().clear()
+        self._removed()
+
+    def clear_edges(self):
+        super().clear_edges()
+        self._removed()
+
+    def _changed(self):
+        self.version += 1
+        self._sorted_adjacency.clear()
+        self._heuristic_scales.clear()
+
+    def _removed(self):
+        self._changed()
+        self._connectivity = None
+
+# Views, e.g., graph.subgraph(cities), are frozen RoadGraphs of their own that see the parent's mutations but aren't told about them, so only a graph that owns its data may keep indexes and caches
+def has_own_caches(graph):
+    return isinstance(graph, RoadGraph) and not nx.is_frozen(graph)
+
+STRATEGY_CACHE_LIMIT = 8
+
+# Neighbor lists sorted by one ordering strategy, or in the graph's own order
+# when there's none, each computed on first use and stored as a tuple
+class SortedAdjacency(dict):
+    def __init__(self, graph, order_by=None):
+        super().__init__()
+        self._graph = graph
+        self._order_by = order_by
+
+    def __missing__(self, node):
+        if self._order_by:
+            neighbors = tuple(sorted(self._graph.neighbors(node), key=self._order_by))
+        else:
+            neighbors = tuple(self._graph.neighbors(node))
+        self[node] = neighbors
+        return neighbors
+
+# A RoadGraph keeps the sorted neighbor lists between traversals until it changes, while any other graph, including a view of a RoadGraph, gets fresh ones for every traversal
+def sorted_adjacency(graph, order_by=None):
+    if has_own_caches(graph):
+        return graph.sorted_adjacency(order_by)
+    return SortedAdjacency(graph, order_by)
+
+# Bumped whenever the snapshot layout changes, which invalidates older snapshots
+SNAPSHOT_VERSION = 5
+
+CHECKSUM_SIZE = hashlib.sha256().digest_size
+
+# Snapshots live in a .graph_cache directory next to the DOT file, one per file path
+def snapshot_path(filename):
+    path = Path(filename).resolve()
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:16]
+    return path.parent / ".graph_cache" / f"{path.name}.{digest}.snapshot"
+
+def file_digest(filename):
+    with open(filename, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+# A graph's snapshot holds its DOT events encoded as one array of string ids, so it's written while the events stream by, and read back without parsing the DOT file
+# A snapshot is valid when the file's size and mtime still match, or when they
+# changed but the content hash didn't, e.g., after touching or copying the file
+def load_snapshot(filename):
+    stat = os.stat(filename)
+    path = snapshot_path(filename)
+    header = {"size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": None}
+
+    stored, strings, arrays = read_snapshot(path) or ({}, [], {})
+    if "codes" in arrays:
+        events = decode_events(strings, arrays["codes"])
+        if (stored.get("size"), stored.get("mtime")) == (header["size"], header["mtime"]):
+            yield from events
+            return
+        header["digest"] = file_digest(filename)
+        if stored.get("digest") == header["digest"]:
+            save_snapshot(path, header, strings, arrays)
+            yield from events
+            return
+
+    header["digest"] = header["digest"] or file_digest(filename)
+    yield from record_snapshot(path, header, read_dot(filename))
+
+# Passes the events through while encoding them, and saves the snapshot once the last one has gone by, so a caller that stops early leaves none behind
+def record_snapshot(path, header, events):
+    encoder = EventEncoder()
+    for event in events:
+        encoder.add(event)
+        yield event
+    save_snapshot(path, header, list(encoder.ids), {"codes": encoder.codes})
+
+NODE_EVENT, EDGE_EVENT = 0, 1
+
+# Each event becomes a run of integers: its kind, the ids of its one or two names, the number of attributes, and the ids of every attribute's key and value
+# A string's id is its position in the string table, so names, keys and values that repeat, e.g., every city's country, are stored and decoded only once
+class EventEncoder:
+    def __init__(self):
+        self.ids = {}
+        self.codes = array("I")
+
+    def add(self, event):
+        match event:
+            case DotNode(name, attributes):
+                self.codes.extend((NODE_EVENT, self._id(name)))
+            case DotEdge(name1, name2, attributes):
+                self.codes.extend((EDGE_EVENT, self._id(name1), self._id(name2)))
+        self.codes.append(len(attributes))
+        for key, value in attributes.items():
+            self.codes.extend((self._id(key), self._id(value)))
+
+    def _id(self, string):
+        return self.ids.setdefault(string, len(self.ids))
+
+def decode_events(strings, codes):
+    codes = iter(codes)
+    for kind in codes:
+        if kind == NODE_EVENT:
+            names = (strings[next(codes)],)
+        else:
+            names = (strings[next(codes)], strings[next(codes)])
+        attributes = {
+            strings[next(codes)]: strings[next(codes)] for _ in range(next(codes))
+        }
+        if kind == NODE_EVENT:
+            yield DotNode(*names, attributes)
+        else:
+            yield DotEdge(*names, attributes)
+
+# A snapshot file is a line of JSON with the header, a line of JSON with the string table, the raw bytes of a few typed arrays, and the SHA-256 checksum of everything before it
+# Nothing in it ever gets executed, unlike a pickle, and the arrays load with a single copy of their bytes, without any parsing
+# Write to a temporary file first so that concurrent readers never see a partial snapshot
+# Caching is best effort: when the snapshot can't be written, e.g., in a read-only directory or on a full disk, the temporary file is removed and the caller carries on
+def save_snapshot(path, header, strings, arrays):
+    header = {
+        **header,
+        "layout": SNAPSHOT_VERSION,
+        "byteorder": sys.byteorder,
+        "arrays": [
+            [name, values.typecode, len(values)] for name, values in arrays.items()
+        ],
     }
-    return nodes, nx.Graph(
-        (nodes[name1], nodes[name2], weights)
-        for name1, name2, weights in graph.edges(data=True)
-    )
+    chunks = [json_line(header), json_line(strings), *arrays.values()]
+    checksum = hashlib.sha256()
+    temporary_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(temporary_path, "wb") as file:
+            for chunk in chunks:
+                checksum.update(chunk)
+                file.write(chunk)
+            file.write(checksum.digest())
+        os.replace(temporary_path, path)
+    except OSError:
+        with suppress(OSError):
+            os.remove(temporary_path)
+
+def json_line(value):
+    return json.dumps(value).encode("utf-8") + b"\n"
+
+# Returns the header, the string table and the arrays of a snapshot in the current layout, or None when there's no such snapshot, or when it's truncated or corrupt
+def read_snapshot(path):
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+    except OSError:
+        return None
+    content = memoryview(data)[:-CHECKSUM_SIZE]
+    if hashlib.sha256(content).digest() != data[-CHECKSUM_SIZE:]:
+        return None
+    try:
+        header_end = data.index(b"\n")
+        strings_end = data.index(b"\n", header_end + 1)
+        header = json.loads(data[:header_end])
+        strings = json.loads(data[header_end + 1:strings_end])
+        if header["layout"] != SNAPSHOT_VERSION:
+            return None
+        arrays, offset = {}, strings_end + 1
+        for name, typecode, length in header["arrays"]:
+            values = array(typecode)
+            values.frombytes(content[offset:offset + length * values.itemsize])
+            if header["byteorder"] != sys.byteorder:
+                values.byteswap()
+            arrays[name] = values
+            offset += length * values.itemsize
+    except (ValueError, TypeError, KeyError):
+        return None
+    if offset != len(content):
+        return None
+    return header, strings, arrays
+
+# One Iterative Engine for Every Traversal
+# order="bfs" visits the nodes level by level, starting from all the sources at once, whereas order="dfs" goes as deep as possible from each source in turn, keeping a stack of neighbor iterators instead of recursing
+# Nodes deeper than max_depth aren't visited, and the traversal ends right after yielding max_nodes nodes; a depth-first depth counts the edges along the search tree, which isn't necessarily the shortest way in
+# pre_visit(node) gets called right before a node is yielded, and post_visit(node) once all of its neighbors have been handled, i.e., after expanding it for BFS or after its whole subtree for DFS
+# A previous dictionary, when given, maps each discovered node to the node it was discovered from, like in dijkstra_search()
+# A within collection, e.g., the cities in a geographic window from a SpatialIndex, keeps the traversal from ever leaving it
+def traverse_graph(
+    graph,
+    sources,
+    order="bfs",
+    order_by=None,
+    max_depth=None,
+    max_nodes=None,
+    pre_visit=None,
+    post_visit=None,
+    previous=None,
+    within=None,
+):
+    if order == "bfs":
+        engine = traverse_breadth_first
+    elif order == "dfs":
+        engine = traverse_depth_first
+    else:
+        raise ValueError(f"unknown order {order!r}")
+    adjacency = sorted_adjacency(graph, order_by)
+    if within is not None:
+        adjacency = WindowedAdjacency(adjacency, within)
+        sources = [source for source in sources if source in within]
+    nodes = engine(adjacency, sources, max_depth, pre_visit, post_visit, previous)
+    return nodes if max_nodes is None else islice(nodes, max_nodes)
+
+# Hides every neighbor outside the window, so the engines don't need to know about it
+class WindowedAdjacency:
+    def __init__(self, adjacency, within):
+        self._adjacency = adjacency
+        self._within = within
+
+    def __getitem__(self, node):
+        return [
+            neighbor for neighbor in self._adjacency[node] if neighbor in self._within
+        ]
+
+def traverse_breadth_first(adjacency, sources, max_depth, pre_visit, post_visit, previous):
+    queue = Queue()
+    visited = set()
+    for source in sources:
+        if source not in visited:
+            visited.add(source)
+            queue.enqueue((source, 0))
+    while queue:
+        node, depth = queue.dequeue()
+        if pre_visit:
+            pre_visit(node)
+        yield node
+        if max_depth is None or depth < max_depth:
+            for neighbor in adjacency[node]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.enqueue((neighbor, depth + 1))
+                    if previous is not None:
+                        previous[neighbor] = node
+        if post_visit:
+            post_visit(node)
+
+# Each stack entry remembers how far the loop over a node's neighbors got, so the search resumes there after backtracking, just like a recursive call would
+def traverse_depth_first(adjacency, sources, max_depth, pre_visit, post_visit, previous):
+    visited = set()
+    for source in sources:
+        if source in visited:
+            continue
+        visited.add(source)
+        if pre_visit:
+            pre_visit(source)
+        yield source
+        stack = Stack((source, 0, iter(adjacency[source] if max_depth != 0 else ())))
+        while stack:
+            node, depth, neighbors = stack.dequeue()
+            for neighbor in neighbors:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    if previous is not None:
+                        previous[neighbor] = node
+                    if pre_visit:
+                        pre_visit(neighbor)
+                    yield neighbor
+                    stack.enqueue((node, depth, neighbors))
+                    if max_depth is None or depth + 1 < max_depth:
+                        stack.enqueue((neighbor, depth + 1, iter(adjacency[neighbor])))
+                    elif post_visit:
+                        post_visit(neighbor)
+                    break
+            else:
+                if post_visit:
+                    post_visit(node)
 
 # Breadth-First Search Using a FIFO Queue
 # The functions does not allow sorting the neighbors in a particular order
@@ -58,18 +484,9 @@ def load_graph(filename, node_factory):
 
 # Shortest Path Using Breadth-First Traversal
 # One possible solution for allowing sorting the neighbors in a particular order
+# The traversal now runs on traverse_graph(), which takes the neighbors pre-sorted from sorted_adjacency()
 def breadth_first_traverse(graph, source, order_by=None):
-    queue = Queue(source)
-    visited = {source}
-    while queue:
-        yield (node := queue.dequeue())
-        neighbors = list(graph.neighbors(node))
-        if order_by:
-            neighbors.sort(key=order_by)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.enqueue(neighbor)
+    return traverse_graph(graph, [source], "bfs", order_by)
 
 # def breadth_first_search(graph, source, predicate, order_by=None):
 #     for node in breadth_first_traverse(graph, source, order_by):
@@ -83,22 +500,12 @@ def breadth_first_search(graph, source, predicate, order_by=None):
 # This new function takes another node as an argument and optionally lets you order the neighbors using a custom strategy
 # It also defines an empty dictionary, which you populate when visiting a neighbor by associating it with the previous node on your path
 # All key-value pairs in this dictionary are immediate neighbors without any nodes between them
+# The destination is found as soon as it's discovered, which is when it enters the dictionary
 def shortest_path(graph, source, destination, order_by=None):
-    queue = Queue(source)
-    visited = {source}
     previous = {}
-    while queue:
-        node = queue.dequeue()
-        neighbors = list(graph.neighbors(node))
-        if order_by:
-            neighbors.sort(key=order_by)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.enqueue(neighbor)
-                previous[neighbor] = node
-                if neighbor == destination:
-                    return retrace(previous, source, destination)
+    for _ in traverse_graph(graph, [source], "bfs", order_by, previous=previous):
+        if destination in previous:
+            return retrace(previous, source, destination)
 
 # To recreate the shortest path between your source and destination, you can iteratively look up the dictionary built earlier when you traversed the graph with the breadth-first approach
 def retrace(previous, source, destination):
@@ -115,38 +522,76 @@ def retrace(previous, source, destination):
     return list(path)
 
 # The breadth-first traversal can tell you whether two nodes remain connected or not
+# A RoadGraph answers from its connectivity index without any search, unless it's a view
+# Otherwise, searching from both ends at once stops as soon as the smaller side runs out of cities, e.g., when one of them sits on an island
 def connected(graph, source, destination):
-    return shortest_path(graph, source, destination) is not None
+    if has_own_caches(graph):
+        if source not in graph or destination not in graph:
+            raise nx.NodeNotFound(f"{source} or {destination} is not in the graph")
+        return graph.connectivity.connected(source, destination)
+    return bidirectional_shortest_path(graph, source, destination) is not None
+
+# Bidirectional Breadth-First Search
+# Two searches grow from the source and the destination, one whole level at a time, always expanding the smaller frontier, until they meet in the middle
+# The first city reached by both searches lies on a shortest path, because the levels expanded so far don't overlap
+def bidirectional_shortest_path(graph, source, destination, order_by=None):
+    adjacency = sorted_adjacency(graph, order_by)
+    forward, backward = {source: None}, {destination: None}
+    forward_frontier, backward_frontier = [source], [destination]
+    meeting = source if source == destination else None
+    while meeting is None and forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meeting = expand_level(
+                adjacency, forward_frontier, forward, backward
+            )
+        else:
+            backward_frontier, meeting = expand_level(
+                adjacency, backward_frontier, backward, forward
+            )
+    if meeting is None:
+        return None
+    return join_paths(forward, backward, source, destination, meeting)
+
+def expand_level(adjacency, frontier, previous, other_previous):
+    next_frontier = []
+    for node in frontier:
+        for neighbor in adjacency[node]:
+            if neighbor not in previous:
+                previous[neighbor] = node
+                next_frontier.append(neighbor)
+                if neighbor in other_previous:
+                    return next_frontier, neighbor
+    return next_frontier, None
+
+# Both halves come from retrace(), and the second one is reversed since it was recorded from the destination's side
+def join_paths(forward, backward, source, destination, meeting):
+    head = retrace(forward, source, meeting)
+    tail = retrace(backward, destination, meeting)
+    return head + tail[-2::-1]
 
 # Depth-First Traversal
 def depth_first_traverse(graph, source, order_by=None):
-    stack = Stack(source)
-    visited = set()
-    while stack:
-        if (node := stack.dequeue()) not in visited:
-            yield node
-            visited.add(node)
-            neighbors = list(graph.neighbors(node))
-            if order_by:
-                neighbors.sort(key=order_by)
-            for neighbor in reversed(neighbors):
-                stack.enqueue(neighbor)
+    return traverse_graph(graph, [source], "dfs", order_by)
 
 # Because the depth-first traversal relies on the stack data structure, you can take advantage of the built-in call stack to save the current search path for later backtracking and rewrite your function recursively
-def recursive_depth_first_traverse(graph, source, order_by=None):
-    visited = set()
-
-    def visit(node):
-        yield node
-        visited.add(node)
-        neighbors = list(graph.neighbors(node))
-        if order_by:
-            neighbors.sort(key=order_by)
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                yield from visit(neighbor)
+# def recursive_depth_first_traverse(graph, source, order_by=None):
+#     visited = set()
+#
+#     def visit(node):
+#         yield node
+#         visited.add(node)
+#         neighbors = list(graph.neighbors(node))
+#         if order_by:
+#             neighbors.sort(key=order_by)
+#         for neighbor in neighbors:
+#             if neighbor not in visited:
+#                 yield from visit(neighbor)
+#
+#     return visit(source)
 
-    return visit(source)
+# Nested generators pay for every level of recursion on each yielded node and hit the recursion limit on long chains of cities, so the function now runs on the iterative engine, whose stack of neighbor iterators mirrors the call stack
+def recursive_depth_first_traverse(graph, source, order_by=None):
+    return traverse_graph(graph, [source], "dfs", order_by)
 
 # With the traversal function in place, you can now implement the depth-first search algorithm
 def depth_first_search(graph, source, predicate, order_by=None):
@@ -158,23 +603,205 @@ def search(traverse, graph, source, predicate, order_by=None):
             return node
 
 # Dijkstra's Algorithm using a Priority Queue
+# Nodes enter the priority queue only once they're discovered, and every node comes out of the generator together with its final distance as soon as it's settled
+def dijkstra_search(graph, source, weight_factory, previous):
+    return multi_source_dijkstra_search(graph, [source], weight_factory, previous)
+
+# With several sources, all of them start at distance zero, so every node gets settled with its distance to the closest source
+def multi_source_dijkstra_search(graph, sources, weight_factory, previous):
+    visited = set()
+
+    unvisited = MutableMinHeap()
+    for source in sources:
+        unvisited[source] = 0
+
+    while unvisited:
+        visited.add(node := unvisited.dequeue())
+        distance = unvisited[node]
+        yield node, distance
+        for neighbor, weights in graph[node].items():
+            if neighbor not in visited:
+                new_distance = distance + weight_factory(weights)
+                if neighbor not in unvisited or new_distance < unvisited[neighbor]:
+                    unvisited[neighbor] = new_distance
+                    previous[neighbor] = node
+
+# The search stops as soon as the destination is settled, so nearby destinations only touch the surrounding part of the graph
 def dijkstra_shortest_path(graph, source, destination, weight_factory):
+    previous = {}
+    expanded = 0
+    for expanded, (node, distance) in enumerate(
+        dijkstra_search(graph, source, weight_factory, previous), 1
+    ):
+        if node == destination:
+            return Route(retrace(previous, source, destination), distance, expanded)
+    return Route(None, infinity, expanded)
+
+# A shortest-path route along with the number of nodes settled to find it
+class Route(NamedTuple):
+    path: list | None
+    distance: float
+    expanded: int
+
+# Runs Dijkstra's algorithm to completion once, so that the resulting tree can answer queries for any number of destinations
+def dijkstra_tree(graph, source, weight_factory):
+    previous = {}
+    distances = dict(dijkstra_search(graph, source, weight_factory, previous))
+    return ShortestPathTree(source, distances, previous)
+
+class ShortestPathTree(NamedTuple):
+    source: Any
+    distances: dict
+    previous: dict
+
+    def distance_to(self, destination):
+        return self.distances.get(destination, infinity)
+
+    def path_to(self, destination):
+        if destination not in self.distances:
+            return None
+        return retrace(self.previous, self.source, destination)
+
+# Bidirectional Dijkstra's Algorithm
+# Two searches settle cities around the source and the destination, always advancing the one whose next city is closer, and keep track of the shortest route seen so far through any city reached by both
+# Once the two closest unsettled cities are together at least as far as that route, nothing shorter can turn up
+class DijkstraFront:
+    def __init__(self, root):
+        self.root = root
+        self.distances = {root: 0}
+        self.previous = {}
+        self.visited = set()
+        self.unvisited = MutableMinHeap()
+        self.unvisited[root] = 0
+
+    def next_distance(self):
+        return self.unvisited[self.unvisited.peek()]
+
+def bidirectional_dijkstra_shortest_path(graph, source, destination, weight_factory):
+    if source == destination:
+        return Route([source], 0, 1)
+
+    forward, backward = DijkstraFront(source), DijkstraFront(destination)
+    best_distance, meeting = infinity, None
+    expanded = 0
+    while forward.unvisited and backward.unvisited:
+        forward_next, backward_next = forward.next_distance(), backward.next_distance()
+        if forward_next + backward_next >= best_distance:
+            break
+        if forward_next <= backward_next:
+            front, other = forward, backward
+        else:
+            front, other = backward, forward
+        front.visited.add(node := front.unvisited.dequeue())
+        expanded += 1
+        distance = front.distances[node]
+        for neighbor, weights in graph[node].items():
+            if neighbor not in front.visited:
+                new_distance = distance + weight_factory(weights)
+                if new_distance < front.distances.get(neighbor, infinity):
+                    front.distances[neighbor] = new_distance
+                    front.unvisited[neighbor] = new_distance
+                    front.previous[neighbor] = node
+                if neighbor in other.distances:
+                    total = front.distances[neighbor] + other.distances[neighbor]
+                    if total < best_distance:
+                        best_distance, meeting = total, neighbor
+
+    if meeting is None:
+        return Route(None, infinity, expanded)
+    path = join_paths(
+        forward.previous, backward.previous, source, destination, meeting
+    )
+    return Route(path, best_distance, expanded)
+
+# Nearest Facility using a Multi-Source Dijkstra's Algorithm
+# One run from all the facilities at once replaces a separate search for every facility, and each node inherits its facility from the node it was reached through, which is always settled earlier
+def nearest_facilities(graph, facilities, weight_factory):
+    previous, nearest, distances = {}, {}, {}
+    for node, distance in multi_source_dijkstra_search(
+        graph, facilities, weight_factory, previous
+    ):
+        nearest[node] = nearest[previous[node]] if node in previous else node
+        distances[node] = distance
+    return FacilityAssignment(nearest, distances, previous)
+
+class FacilityAssignment(NamedTuple):
+    nearest: dict
+    distances: dict
+    previous: dict
+
+    def facility_for(self, node):
+        return self.nearest.get(node)
+
+    def distance_to(self, node):
+        return self.distances.get(node, infinity)
+
+    # The path leads from the facility to the node
+    def path_to(self, node):
+        if node not in self.nearest:
+            return None
+        return retrace(self.previous, self.nearest[node], node)
+
+# A* Search using the Great-Circle Distance as a Heuristic
+EARTH_RADIUS_MILES = 3958.8
+
+def great_circle_distance(city1, city2):
+    latitude1, latitude2 = radians(city1.latitude), radians(city2.latitude)
+    half_chord = (
+        sin((latitude2 - latitude1) / 2) ** 2
+        + cos(latitude1) * cos(latitude2)
+        * sin(radians(city2.longitude - city1.longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * asin(sqrt(half_chord))
+
+# The smallest ratio of edge weight to straight-line distance over all edges, so that the scaled great-circle distance never overestimates the remaining cost, whatever the weight's unit
+# A RoadGraph caches the scale per weight function until it changes, while any other graph, including a view of a RoadGraph, gets it computed for every query
+def heuristic_scale(graph, weight_factory):
+    if has_own_caches(graph):
+        return graph.heuristic_scale(weight_factory)
+    return compute_heuristic_scale(graph, weight_factory)
+
+def compute_heuristic_scale(graph, weight_factory):
+    return min(
+        (
+            weight_factory(weights) / straight_line
+            for city1, city2, weights in graph.edges(data=True)
+            if (straight_line := great_circle_distance(city1, city2)) > 0
+        ),
+        default=0.0,
+    )
+
+def great_circle_heuristic(graph, destination, weight_factory):
+    scale = heuristic_scale(graph, weight_factory)
+
+    def heuristic(city):
+        return scale * great_circle_distance(city, destination)
+
+    return heuristic
+
+# Same as Dijkstra's algorithm, but the priority queue orders nodes by their distance from the source plus the estimated distance left to the destination
+def a_star_shortest_path(graph, source, destination, weight_factory, heuristic=None):
+    if heuristic is None:
+        heuristic = great_circle_heuristic(graph, destination, weight_factory)
+
     previous = {}
     visited = set()
+    distances = {source: 0}
 
     unvisited = MutableMinHeap()
-    for node in graph.nodes:
-        unvisited[node] = infinity
-    unvisited[source] = 0
+    unvisited[source] = heuristic(source)
 
     while unvisited:
         visited.add(node := unvisited.dequeue())
+        if node == destination:
+            path = retrace(previous, source, destination)
+            return Route(path, distances[node], len(visited))
         for neighbor, weights in graph[node].items():
             if neighbor not in visited:
-                weight = weight_factory(weights)
-                new_distance = unvisited[node] + weight
-                if new_distance < unvisited[neighbor]:
-                    unvisited[neighbor] = new_distance
+                new_distance = distances[node] + weight_factory(weights)
+                if new_distance < distances.get(neighbor, infinity):
+                    distances[neighbor] = new_distance
+                    unvisited[neighbor] = new_distance + heuristic(neighbor)
                     previous[neighbor] = node
 
-    return retrace(previous, source, destination)
\ No newline at end of file
+    return Route(None, infinity, len(visited))
@@ -1,6 +1,8 @@
 # Reading the DOT file (the UK road map) with the graph data type
 
 import networkx as nx
+from route_cache import RouteCache
+from spatial_index import SpatialIndex
 from graph import (
     City,
     load_graph,
@@ -10,7 +12,11 @@ from graph import (
     connected,
     depth_first_traverse,
     depth_first_search as dfs,
-    dijkstra_shortest_path
+    dijkstra_shortest_path,
+    bidirectional_shortest_path,
+    bidirectional_dijkstra_shortest_path,
+    traverse_graph,
+    nearest_facilities
 )
 
 # Testing the class City and from_dict() and load_graph() function
@@ -149,8 +155,10 @@ city2 = nodes["edinburgh"]
 def distance(weights):
     return float(weights["distance"])
 
-for city in dijkstra_shortest_path(graph, city1, city2, distance):
+route = dijkstra_shortest_path(graph, city1, city2, distance)
+for city in route.path:
     print(city.name)
+print(f"{route.distance:.0f} miles, {route.expanded} cities settled")
 
 # Networkx implementation
 print("\nCompare to Networkx implementation:")
@@ -158,4 +166,60 @@ def weight(node1, node2, weights):
     return distance(weights)
 
 for city in nx.dijkstra_path(graph, city1, city2, weight):
-    print(city.name)
\ No newline at end of file
+    print(city.name)
+# Testing the bidirectional searches, which meet in the middle
+print("\n14th testing: Bidirectional search:")
+print(" → ".join(city.name for city in bidirectional_shortest_path(graph, city1, city2)))
+print(connected(graph, nodes["belfast"], nodes["glasgow"]))
+route = bidirectional_dijkstra_shortest_path(graph, city1, city2, distance)
+print(" → ".join(city.name for city in route.path))
+print(f"{route.distance:.0f} miles, {route.expanded} cities settled")
+
+# Testing the route cache, which answers repeated queries without searching again
+print("\n15th testing: Route cache:")
+# The cache works on a copy, so that adding a road doesn't change the graph used by the next tests
+road_map = graph.copy()
+routes = RouteCache(road_map, maxsize=100)
+for _ in range(3):
+    routes.dijkstra_shortest_path(city1, city2, distance)
+    routes.shortest_path(city1, city2)
+print(routes.info())
+road_map.add_edge(city1, city2, distance=1000)
+routes.dijkstra_shortest_path(city1, city2, distance)
+print(routes.info())
+
+# Testing the traversal engine with several sources, a depth limit and a visitor callback
+print("\n16th testing: Traversal engine:")
+finished = []
+for city in traverse_graph(
+    graph,
+    [nodes["london"], nodes["edinburgh"]],
+    order="dfs",
+    order_by=by_latitude,
+    max_depth=2,
+    post_visit=finished.append,
+):
+    print("📍", city.name)
+print("Finished:", ", ".join(city.name for city in finished))
+
+# Testing the spatial index over the cities' coordinates
+print("\n17th testing: Spatial index:")
+index = SpatialIndex(nodes.values())
+for city, miles in index.nearest(53.4, -2.2, k=3):
+    print(f"{city.name}: {miles:.1f} miles")
+print(", ".join(city.name for city, _ in index.within_radius(51.5, -0.1, 30)))
+window = set(index.within_box(51.3, -5.5, 53.5, -2.6))
+print(", ".join(city.name for city in traverse_graph(graph, [nodes["cardiff"]], within=window)))
+
+# Testing the nearest-facility search, which runs Dijkstra's algorithm from all the depots at once
+print("\n18th testing: Nearest depot:")
+depots = [nodes["london"], nodes["manchester"], nodes["glasgow"]]
+assignment = nearest_facilities(graph, depots, distance)
+for name in ("oxford", "leeds", "edinburgh", "belfast"):
+    city = nodes[name]
+    depot = assignment.facility_for(city)
+    if depot is None:
+        print(f"{city.name}: no depot reachable")
+    else:
+        route = " → ".join(stop.name for stop in assignment.path_to(city))
+        print(f"{city.name}: {depot.name}, {assignment.distance_to(city):.0f} miles ({route})")
@@ -0,0 +1,64 @@
+# Caching the answers to repeated route queries between the same cities
+# Entries are keyed by the query's arguments, including the weight function or
+# the order_by strategy, and the least recently used one is evicted once the
+# cache is full
+# The cache is tied to one graph and empties itself as soon as the graph's
+# version changes, which RoadGraph bumps on every mutation; plain networkx
+# graphs have no version, so clear() the cache by hand after changing them
+
+# Necessary modules
+from collections import OrderedDict
+from typing import NamedTuple
+
+from graph import dijkstra_shortest_path, shortest_path
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class RouteCache:
+    def __init__(self, graph, maxsize=1024):
+        self.graph = graph
+        self.maxsize = maxsize
+        self._routes = OrderedDict()
+        self._version = getattr(graph, "version", None)
+        self._hits = self._misses = 0
+
+    def __len__(self):
+        return len(self._routes)
+
+    # The returned paths are shared with the cache, so don't modify them
+    def shortest_path(self, source, destination, order_by=None):
+        key = (shortest_path, source, destination, order_by)
+        return self._lookup(key, shortest_path, source, destination, order_by)
+
+    def dijkstra_shortest_path(self, source, destination, weight_factory):
+        key = (dijkstra_shortest_path, source, destination, weight_factory)
+        return self._lookup(
+            key, dijkstra_shortest_path, source, destination, weight_factory
+        )
+
+    def info(self):
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._routes))
+
+    def clear(self):
+        self._routes.clear()
+        self._hits = self._misses = 0
+
+    def _lookup(self, key, function, *args):
+        if (version := getattr(self.graph, "version", None)) != self._version:
+            self._routes.clear()
+            self._version = version
+        try:
+            self._routes.move_to_end(key)
+        except KeyError:
+            self._misses += 1
+            route = self._routes[key] = function(self.graph, *args)
+            if len(self._routes) > self.maxsize:
+                self._routes.popitem(last=False)
+            return route
+        else:
+            self._hits += 1
+            return self._routes[key]
@@ -0,0 +1,182 @@
+# A spatial index over the coordinates of the cities in the road map
+# Every city becomes a point on the unit sphere, and a k-d tree splits those
+# 3D points along x, y and z in turn, so a query only descends into the parts
+# of the tree that can still hold an answer
+# Straight-line (chord) distances through the sphere grow with great-circle
+# distances, which makes the tree's axis-aligned bounds exact for the
+# haversine formula, with no special cases near the poles or the antimeridian
+
+# Necessary modules
+from heapq import heappush, heapreplace
+from math import cos, pi, radians, sin
+from typing import NamedTuple
+
+from graph import EARTH_RADIUS_MILES, great_circle_distance
+
+class Location(NamedTuple):
+    latitude: float
+    longitude: float
+
+def unit_vector(latitude, longitude):
+    latitude, longitude = radians(latitude), radians(longitude)
+    return (
+        cos(latitude) * cos(longitude),
+        cos(latitude) * sin(longitude),
+        sin(latitude),
+    )
+
+def chord_length(miles):
+    return 2 * sin(min(miles / EARTH_RADIUS_MILES, pi) / 2)
+
+class SpatialIndex:
+    # The points are laid out so that the median of every range [start, stop)
+    # sits at its middle, which makes the tree implicit and perfectly balanced
+    def __init__(self, cities):
+        entries = [
+            (unit_vector(city.latitude, city.longitude), city) for city in cities
+        ]
+        build_kd_tree(entries, 0, len(entries), 0)
+        self._points = [point for point, _ in entries]
+        self._cities = [city for _, city in entries]
+
+    def __len__(self):
+        return len(self._cities)
+
+    # Returns up to k (city, distance in miles) pairs, closest first
+    def nearest(self, latitude, longitude, k=1):
+        target = unit_vector(latitude, longitude)
+        best = []  # max-heap of (-squared chord, index) pairs
+
+        def visit(start, stop, axis):
+            if start >= stop:
+                return
+            middle = (start + stop) // 2
+            point = self._points[middle]
+            squared = squared_distance(point, target)
+            if len(best) < k:
+                heappush(best, (-squared, middle))
+            elif squared < -best[0][0]:
+                heapreplace(best, (-squared, middle))
+            offset = target[axis] - point[axis]
+            near, far = (start, middle), (middle + 1, stop)
+            if offset > 0:
+                near, far = far, near
+            visit(*near, (axis + 1) % 3)
+            if len(best) < k or offset * offset < -best[0][0]:
+                visit(*far, (axis + 1) % 3)
+
+        if k > 0:
+            visit(0, len(self._points), 0)
+        return self._with_distances(
+            (latitude, longitude), (index for _, index in best)
+        )
+
+    # Returns the (city, distance in miles) pairs within the radius, closest first
+    def within_radius(self, latitude, longitude, miles):
+        target = unit_vector(latitude, longitude)
+        squared_radius = chord_length(miles) ** 2
+        found = []
+
+        def visit(start, stop, axis):
+            if start >= stop:
+                return
+            middle = (start + stop) // 2
+            point = self._points[middle]
+            if squared_distance(point, target) <= squared_radius:
+                found.append(middle)
+            offset = target[axis] - point[axis]
+            if offset <= 0 or offset * offset <= squared_radius:
+                visit(start, middle, (axis + 1) % 3)
+            if offset >= 0 or offset * offset <= squared_radius:
+                visit(middle + 1, stop, (axis + 1) % 3)
+
+        visit(0, len(self._points), 0)
+        return self._with_distances((latitude, longitude), found)
+
+    # Returns the cities inside a latitude/longitude box, which wraps around the
+    # antimeridian when west > east
+    # The tree prunes with the 3D box that encloses the geographic one, and the
+    # cities found there are then checked against the exact bounds
+    def within_box(self, south, west, north, east):
+        lower, upper = enclosing_box(south, west, north, east)
+        found = []
+
+        def visit(start, stop, axis):
+            if start >= stop:
+                return
+            middle = (start + stop) // 2
+            point = self._points[middle]
+            if all(lower[i] <= point[i] <= upper[i] for i in range(3)):
+                city = self._cities[middle]
+                if south <= city.latitude <= north and in_longitudes(
+                    city.longitude, west, east
+                ):
+                    found.append(city)
+            if lower[axis] <= point[axis]:
+                visit(start, middle, (axis + 1) % 3)
+            if point[axis] <= upper[axis]:
+                visit(middle + 1, stop, (axis + 1) % 3)
+
+        visit(0, len(self._points), 0)
+        return found
+
+    def _with_distances(self, coordinates, indices):
+        location = Location(*coordinates)
+        cities = [self._cities[index] for index in indices]
+        pairs = [(city, great_circle_distance(location, city)) for city in cities]
+        return sorted(pairs, key=lambda pair: pair[1])
+
+def squared_distance(point1, point2):
+    return (
+        (point1[0] - point2[0]) ** 2
+        + (point1[1] - point2[1]) ** 2
+        + (point1[2] - point2[2]) ** 2
+    )
+
+def build_kd_tree(entries, start, stop, axis):
+    if stop - start <= 1:
+        return
+    entries[start:stop] = sorted(
+        entries[start:stop], key=lambda entry: entry[0][axis]
+    )
+    middle = (start + stop) // 2
+    build_kd_tree(entries, start, middle, (axis + 1) % 3)
+    build_kd_tree(entries, middle + 1, stop, (axis + 1) % 3)
+
+def in_longitudes(longitude, west, east):
+    if west <= east:
+        return west <= longitude <= east
+    return longitude >= west or longitude <= east
+
+# Keeps cities right on the edge of the box from being pruned by rounding errors
+ROUNDING_MARGIN = 1e-12
+
+# z only depends on the latitude, while x and y are cos(latitude) times the
+# cosine and sine of the longitude, so their ranges are products of the ranges
+# of the factors, whose extremes lie at the ends or at multiples of 90 degrees
+def enclosing_box(south, west, north, east):
+    if east < west:
+        east += 360
+    cos_latitude = value_range(cos, south, north)
+    cos_longitude = value_range(cos, west, east)
+    sin_longitude = value_range(sin, west, east)
+    x = product_range(cos_latitude, cos_longitude)
+    y = product_range(cos_latitude, sin_longitude)
+    z = (sin(radians(south)), sin(radians(north)))
+    return (
+        (x[0] - ROUNDING_MARGIN, y[0] - ROUNDING_MARGIN, z[0] - ROUNDING_MARGIN),
+        (x[1] + ROUNDING_MARGIN, y[1] + ROUNDING_MARGIN, z[1] + ROUNDING_MARGIN),
+    )
+
+def value_range(function, start, stop):
+    angles = [start, stop]
+    right_angle = 90 * (start // 90 + 1)
+    while right_angle < stop:
+        angles.append(right_angle)
+        right_angle += 90
+    values = [function(radians(angle)) for angle in angles]
+    return min(values), max(values)
+
+def product_range(range1, range2):
+    products = [value1 * value2 for value1 in range1 for value2 in range2]
+    return min(products), max(products)
@@ -0,0 +1,5 @@
+# Benchmark suite for the queue data types against their stdlib equivalents
+# To run it from the repository root, type this command:
+# $ python -m benchmarks --sizes 1000 10000 100000 --output results.json
+# To compare a new run against earlier results and flag regressions:
+# $ python -m benchmarks --baseline results.json --output new.json
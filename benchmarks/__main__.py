@@ -0,0 +1,133 @@
+# Runs every workload on every implementation and size, prints a table, and
+# optionally writes the results as JSON or compares them with a baseline
+
+import argparse
+import json
+import platform
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from time import perf_counter
+
+from .workloads import WORKLOADS, all_implementations, fill, run_workload
+
+def measure_time(workload, implementation, size, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t1 = perf_counter()
+        operations = run_workload(workload, implementation, size)
+        best = min(best, perf_counter() - t1)
+    return operations, best
+
+def measure_memory(implementation, size):
+    tracemalloc.start()
+    try:
+        run_workload(fill, implementation, size)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run(args):
+    implementations = [
+        implementation
+        for implementation in all_implementations()
+        if not args.filter or any(f in implementation.name for f in args.filter)
+    ]
+    results = []
+    for size in args.sizes:
+        for implementation in implementations:
+            for name, (workload, kinds) in WORKLOADS.items():
+                if implementation.kind not in kinds:
+                    continue
+                operations, seconds = measure_time(
+                    workload, implementation, size, args.repeat
+                )
+                results.append({
+                    "workload": name,
+                    "implementation": implementation.name,
+                    "kind": implementation.kind,
+                    "size": size,
+                    "seconds": seconds,
+                    "ops_per_second": operations / seconds,
+                })
+                print_row(results[-1])
+            if args.memory:
+                results.append({
+                    "workload": "peak-memory",
+                    "implementation": implementation.name,
+                    "kind": implementation.kind,
+                    "size": size,
+                    "peak_bytes": measure_memory(implementation, size),
+                })
+                print_row(results[-1])
+    return results
+
+def print_row(result):
+    if "peak_bytes" in result:
+        measurement = f"{result['peak_bytes'] / 2**20:>10.2f} MB peak"
+    else:
+        measurement = (
+            f"{result['seconds']:>10.4f}s {result['ops_per_second']:>14,.0f} ops/s"
+        )
+    print(
+        f"{result['workload']:>14} {result['implementation']:>24}"
+        f" {result['size']:>10} {measurement}"
+    )
+
+def key(result):
+    return result["workload"], result["implementation"], result["size"]
+
+# A result regresses when it's slower, or uses more memory, than the baseline
+# by more than the tolerance
+def compare(results, baseline, tolerance):
+    previous = {key(result): result for result in baseline["results"]}
+    regressions = []
+    for result in results:
+        if (old := previous.get(key(result))) is None:
+            continue
+        metric = "peak_bytes" if "peak_bytes" in result else "seconds"
+        if result[metric] > old[metric] * (1 + tolerance):
+            regressions.append((result, old, metric))
+    for result, old, metric in regressions:
+        print(
+            f"REGRESSION {' / '.join(map(str, key(result)))}:"
+            f" {metric} {old[metric]:.4g} -> {result[metric]:.4g}",
+            file=sys.stderr,
+        )
+    return regressions
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-s", "--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5]
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("-f", "--filter", nargs="+", help="implementation names")
+    parser.add_argument("-o", "--output", help="write the results as JSON")
+    parser.add_argument("-b", "--baseline", help="JSON results to compare with")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.10)
+    parser.add_argument("--no-memory", dest="memory", action="store_false")
+    return parser.parse_args()
+
+def main(args):
+    results = run(args)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            if compare(results, json.load(file), args.tolerance):
+                return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,248 @@
+# Implementations under test and the workloads that exercise them
+# Every implementation is a factory returning plain callables bound to a fresh
+# container, so each workload pays one Python-level call per operation for the
+# stdlib structures and for the repo's data types alike
+
+import asyncio
+import queue
+import sys
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
+from pathlib import Path
+from random import Random
+from typing import Callable, NamedTuple
+
+# The roadmap copy of queues.py has every data type, including MutableMinHeap
+sys.path.insert(0, str(Path(__file__).parents[1] / "Roadmap of the United Kingdom"))
+
+from queues import (  # noqa: E402
+    HEAP_ENGINES,
+    BoundedQueue,
+    CompactMutableMinHeap,
+    CompactPriorityQueue,
+    MutableMinHeap,
+    PriorityQueue,
+    Queue,
+    SpillingQueue,
+    Stack,
+)
+
+class Implementation(NamedTuple):
+    name: str
+    kind: str
+    make: Callable
+
+# FIFO and LIFO containers return (push, pop)
+def fifo_implementations():
+    def bind(factory, push, pop):
+        def make(size):
+            container = factory(size)
+            return getattr(container, push), getattr(container, pop)
+        return make
+
+    return [
+        Implementation("Queue", "fifo", bind(lambda _: Queue(), "enqueue", "dequeue")),
+        Implementation(
+            "BoundedQueue",
+            "fifo",
+            bind(lambda size: BoundedQueue(size), "enqueue", "dequeue"),
+        ),
+        Implementation(
+            "SpillingQueue",
+            "fifo",
+            bind(lambda _: SpillingQueue(), "enqueue", "dequeue"),
+        ),
+        Implementation("deque", "fifo", bind(lambda _: deque(), "append", "popleft")),
+        Implementation(
+            "queue.Queue", "fifo", bind(lambda _: queue.Queue(), "put", "get")
+        ),
+        Implementation(
+            "asyncio.Queue",
+            "fifo",
+            bind(lambda _: asyncio.Queue(), "put_nowait", "get_nowait"),
+        ),
+        Implementation("Stack", "lifo", bind(lambda _: Stack(), "enqueue", "dequeue")),
+        Implementation("deque (LIFO)", "lifo", bind(lambda _: deque(), "append", "pop")),
+        Implementation("list", "lifo", bind(lambda _: [], "append", "pop")),
+        Implementation(
+            "queue.LifoQueue", "lifo", bind(lambda _: queue.LifoQueue(), "put", "get")
+        ),
+        Implementation(
+            "asyncio.LifoQueue",
+            "lifo",
+            bind(lambda _: asyncio.LifoQueue(), "put_nowait", "get_nowait"),
+        ),
+    ]
+
+# Priority queues return (push(priority, value), pop); the stdlib ones get the
+# usual (priority, counter, value) tuple wrapper that user code would write
+def priority_implementations():
+    def repo_type(factory):
+        def make(_):
+            container = factory()
+            return container.enqueue_with_priority, container.dequeue
+        return make
+
+    def heapq_list(_):
+        heap, counter = [], count()
+
+        def push(priority, value):
+            heappush(heap, (-priority, next(counter), value))
+
+        def pop():
+            return heappop(heap)[-1]
+
+        return push, pop
+
+    def stdlib_type(factory, put, get):
+        def make(_):
+            container, counter = factory(), count()
+            put_method, get_method = getattr(container, put), getattr(container, get)
+
+            def push(priority, value):
+                put_method((-priority, next(counter), value))
+
+            def pop():
+                return get_method()[-1]
+
+            return push, pop
+        return make
+
+    return [
+        *(
+            Implementation(
+                f"PriorityQueue[{engine}]",
+                "priority",
+                repo_type(lambda engine=engine: PriorityQueue(engine)),
+            )
+            for engine in HEAP_ENGINES
+        ),
+        Implementation("CompactPriorityQueue", "priority", repo_type(CompactPriorityQueue)),
+        Implementation("heapq", "priority", heapq_list),
+        Implementation(
+            "queue.PriorityQueue",
+            "priority",
+            stdlib_type(queue.PriorityQueue, "put", "get"),
+        ),
+        Implementation(
+            "asyncio.PriorityQueue",
+            "priority",
+            stdlib_type(asyncio.PriorityQueue, "put_nowait", "get_nowait"),
+        ),
+    ]
+
+# Decrease-key containers return (set(value, priority), pop); plain heapq has
+# no decrease-key, so it pushes duplicates and skips the stale ones on pop
+def decrease_key_implementations():
+    def repo_type(factory):
+        def make(_):
+            heap = factory()
+            return heap.__setitem__, heap.dequeue
+        return make
+
+    def heapq_lazy(_):
+        heap, best, counter = [], {}, count()
+
+        def set_priority(value, priority):
+            best[value] = priority
+            heappush(heap, (priority, next(counter), value))
+
+        def pop():
+            while True:
+                priority, _, value = heappop(heap)
+                if best.get(value) == priority:
+                    del best[value]
+                    return value
+
+        return set_priority, pop
+
+    return [
+        *(
+            Implementation(
+                f"MutableMinHeap[{engine}]",
+                "decrease-key",
+                repo_type(lambda engine=engine: MutableMinHeap(engine)),
+            )
+            for engine in HEAP_ENGINES
+        ),
+        Implementation(
+            "CompactMutableMinHeap", "decrease-key", repo_type(CompactMutableMinHeap)
+        ),
+        Implementation("heapq (lazy deletion)", "decrease-key", heapq_lazy),
+    ]
+
+def all_implementations():
+    return (
+        fifo_implementations()
+        + priority_implementations()
+        + decrease_key_implementations()
+    )
+
+# Workloads take (implementation, size, random) and return the number of
+# operations they performed; fill() only pushes and is also used for memory
+
+def push_values(implementation, push, values, random):
+    if implementation.kind in ("fifo", "lifo"):
+        for value in values:
+            push(value)
+    elif implementation.kind == "priority":
+        for value in values:
+            push(random.random(), value)
+    else:
+        for value in values:
+            push(value, random.random())
+
+def fill(implementation, size, random):
+    push, _ = implementation.make(size)
+    push_values(implementation, push, range(size), random)
+    return size
+
+def push_pop(implementation, size, random):
+    push, pop = implementation.make(size)
+    push_values(implementation, push, range(size), random)
+    for _ in range(size):
+        pop()
+    return 2 * size
+
+# Steady state: the container holds `size` elements while one push and one
+# pop alternate
+def mixed(implementation, size, random):
+    push, pop = implementation.make(2 * size)
+    push_values(implementation, push, range(size), random)
+    if implementation.kind in ("fifo", "lifo"):
+        for value in range(size, 2 * size):
+            push(value)
+            pop()
+    elif implementation.kind == "priority":
+        for value in range(size, 2 * size):
+            push(random.random(), value)
+            pop()
+    else:
+        for value in range(size, 2 * size):
+            push(value, random.random())
+            pop()
+    return 3 * size
+
+# Dijkstra-like: every value is inserted, lowered twice on average, then popped
+def decrease_key(implementation, size, random):
+    set_priority, pop = implementation.make(size)
+    priorities = [1.0] * size
+    for value in range(size):
+        set_priority(value, 1.0)
+    for _ in range(2 * size):
+        value = random.randrange(size)
+        priorities[value] *= random.random()
+        set_priority(value, priorities[value])
+    for _ in range(size):
+        pop()
+    return 4 * size
+
+WORKLOADS = {
+    "push-pop": (push_pop, ("fifo", "lifo", "priority", "decrease-key")),
+    "mixed": (mixed, ("fifo", "lifo", "priority", "decrease-key")),
+    "decrease-key": (decrease_key, ("decrease-key",)),
+}
+
+def run_workload(workload, implementation, size, seed=42):
+    return workload(implementation, size, Random(seed))